@@ -78,7 +78,8 @@ setup(
         'pylint',
         'mock',
         'pep8==1.7.1',
-        'Sphinx==1.8.4'
+        'Sphinx==1.8.4',
+        'importlib_resources; python_version < "3.9"'
     ],
     entry_points={
         'console_scripts': [
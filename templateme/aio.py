@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Asyncio interface for TemplateMe.
+
+The module allows generating projects from templates inside an asyncio
+event loop. All blocking work (searching templates, reading elements and
+writing files) is done by a bounded pool of threads, so many projects can
+be generated concurrently without blocking the loop::
+
+    async with AsyncGenerator(max_workers=8) as generator:
+        await generator.generate("cpp", "/tmp/project", {'class': "Foo"})
+
+Values of arguments are kept for every generation separately, so the
+same template can be generated with different arguments at once. Nothing
+is printed on the screen, paths of written files are returned instead.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from templateme.containers.abstract import TemplateError
+from templateme.writer import ProjectWriter
+
+
+class AsyncGenerator:
+    """ Generator of projects for asyncio applications. """
+
+    def __init__(self, manager=None, max_workers=4):
+        self.__manager = manager
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers)
+        # Searching templates changes shared caches, writing files does not.
+        self.__lock = threading.Lock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        # threads can still write files of failed generation, they are
+        # awaited without blocking the loop
+        await asyncio.get_event_loop().run_in_executor(None, self.close)
+
+    def close(self):
+        """ Stop threads of generator, wait for running tasks. """
+        self.__executor.shutdown(wait=True)
+
+    async def _run(self, function, *args, **kwargs):
+        """ Run blocking function in pool of threads. """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.__executor,
+                                          functools.partial(function, *args, **kwargs))
+
+    def __locked(self, function, *args):
+        """ Call function which changes shared caches. """
+        with self.__lock:
+            return function(*args)
+
+    def __get_manager(self):
+        """ Manager of templates, created on first use. """
+        if self.__manager is None:
+            from templateme.manager import TMPManager
+            self.__manager = TMPManager(name=None)
+        return self.__manager
+
+    async def get_manager(self):
+        """ Get manager of templates. """
+        return await self._run(self.__locked, self.__get_manager)
+
+    def __get_template(self, name):
+        """ Find template with all data needed to render it. """
+        template = self.__get_manager().get_template(name)
+        if template is None:
+            raise TemplateError("There are not template name: {}".format(name))
+        # Read manifests, includes and elements once, before rendering.
+        template.args  # pylint: disable=W0104
+        template.elements  # pylint: disable=W0104
+        return template
+
+    async def get_template(self, name):
+        """ Find template by name. """
+        return await self._run(self.__locked, self.__get_template, name)
+
+    async def load_elements(self, template):
+        """ List of template's elements. """
+        return await self._run(self.__locked, lambda: list(template.elements))
+
+    async def load_text(self, element):
+        """ Source text of element. """
+        return await self._run(element.load_txt)
+
+    @staticmethod
+    def __session(template, arguments, project_name):
+        """ Session with values of arguments for one generation. """
+        template.check_args(arguments)
+        return template.manager.create_session(template, arguments, project_name)
+
+    @staticmethod
+    def __write(element, path, session, writer):
+        """ Render element in session and write it in path. """
+        save_path, _ = element.write(path, session=session, writer=writer)
+        return save_path
+
+    async def generate(self, template_name, path, arguments=None,
+                       project_name=None, force=False):
+        """
+        Generate project from template in path.
+
+        Return list of written files, in order of template's elements.
+        """
+        template = await self.get_template(template_name)
+        session = await self._run(self.__locked, AsyncGenerator.__session,
+                                  template, arguments, project_name)
+        if not force:
+            await self._run(template.examine_save, path)
+        elements = await self.load_elements(template)
+        writer = ProjectWriter(path)
+        return await asyncio.gather(*[self._run(AsyncGenerator.__write, element, path,
+                                                session, writer)
+                                      for element in elements])
+
+
+async def generate(template_name, path, arguments=None, project_name=None,
+                   force=False, max_workers=4):
+    """ Generate one project from template with new generator. """
+    async with AsyncGenerator(max_workers=max_workers) as generator:
+        return await generator.generate(template_name, path, arguments,
+                                        project_name=project_name, force=force)
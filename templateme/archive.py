@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Module to write generated project to archive.
+
+Elements are rendered straight into tar or zip archive, which can be a
+file or any binary file object (e.g. response of web server), so the
+tree of project is never written on disk. Tar entries need their size
+before data, so every element is rendered into spooled buffer first,
+which is kept in memory for files smaller than :data:`SPOOL_SIZE`.
+"""
+
+import os
+import sys
+import time
+import tarfile
+import zipfile
+import tempfile
+
+# Mode of tarfile for every format, zip archive does not use it.
+ARCHIVE_FORMATS = {
+    'tar': "w|",
+    'tar.gz': "w|gz",
+    'tar.bz2': "w|bz2",
+    'tar.xz': "w|xz",
+    'zip': None
+}
+# Size of rendered element kept in memory before it is written to archive.
+SPOOL_SIZE = 1024 * 1024
+
+
+def archive_path(path, archive_format):
+    """ Path of archive file with extension of format. """
+    extension = "." + archive_format
+    return path if path.endswith(extension) else path + extension
+
+
+class ArchiveWriter:
+    """
+    Writer of project's files in archive.
+
+    ``output`` is path of archive file or binary file object. Files are
+    added to archive in ``root`` directory.
+    """
+
+    def __init__(self, output, archive_format="tar.gz", root=""):
+        if archive_format not in ARCHIVE_FORMATS:
+            raise ValueError("Unknown archive format: {}".format(archive_format))
+        self.root = root
+        self.__path = None
+        if isinstance(output, str):
+            self.__path = output
+            output = open(output, "wb")
+        self.__output = output
+        self.__mtime = time.time()
+        try:
+            if archive_format == "zip":
+                self.__tar = None
+                self.__zip = zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED)
+            else:
+                self.__tar = tarfile.open(fileobj=output, mode=ARCHIVE_FORMATS[archive_format])
+                self.__zip = None
+        except Exception:
+            if self.__path is not None:
+                output.close()
+                os.remove(self.__path)
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        if exc_type is not None and self.__path is not None:
+            os.remove(self.__path)
+
+    def name(self, path):
+        """ Name of file in archive. """
+        return "/".join(part for part in (self.root, path.replace(os.sep, "/")) if part)
+
+    def add(self, path, render):
+        """
+        Add file to archive.
+
+        ``render`` is called with binary file object where content of file
+        should be written. Its result is returned.
+        """
+        if self.__zip is not None:
+            return self.__add_zip(self.name(path), render)
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as spool:
+            result = render(spool)
+            info = tarfile.TarInfo(self.name(path))
+            info.size = spool.tell()
+            info.mtime = self.__mtime
+            info.mode = 0o644
+            spool.seek(0)
+            self.__tar.addfile(info, spool)
+        return result
+
+    def __add_zip(self, name, render):
+        """ Add file to zip archive. """
+        info = zipfile.ZipInfo(name, time.localtime(self.__mtime)[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = 0o644 << 16
+        if sys.version_info >= (3, 6):
+            with self.__zip.open(info, "w") as entry:
+                return render(entry)
+        # python 3.5 cannot stream entries of zip archive
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as spool:
+            result = render(spool)
+            spool.seek(0)
+            self.__zip.writestr(info, spool.read())
+        return result
+
+    def close(self):
+        """ Finish archive, file object given by user is not closed. """
+        if self.__zip is not None:
+            self.__zip.close()
+        else:
+            self.__tar.close()
+        if self.__path is not None:
+            self.__output.close()
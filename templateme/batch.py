@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Module to generate many projects from one template.
+
+Every set of arguments is a dictionary with values of template's
+arguments and ``project`` key with the path of generated project. Sets
+are read from CSV file (one column for every argument) or from JSONL
+file (one JSON object in every line)::
+
+    project,class
+    services/users,Users
+    services/orders,Orders
+
+Template is loaded once for all projects. Elements are compiled once,
+files which are copied without rendering are read once and projects are
+written by pool of threads.
+"""
+
+import os
+import csv
+import json
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from templateme.containers.abstract import TemplateError
+from templateme.writer import ProjectWriter
+
+# Key of argument's set with path of project.
+PROJECT_KEY = "project"
+
+
+def read_argument_sets(path):
+    """
+    Read sets of arguments from CSV or JSONL file.
+
+    Numbers and other scalar values are converted to strings. Raise
+    TemplateError if set has not project, has empty field of CSV row or
+    nested value.
+    """
+    with open(path, newline="") as sets_file:
+        if path.endswith(".csv"):
+            argument_sets = list(csv.DictReader(sets_file))
+        else:
+            argument_sets = [json.loads(line) for line in sets_file if line.strip()]
+    for number, arguments in enumerate(argument_sets, 1):
+        if not isinstance(arguments, dict) or not arguments.get(PROJECT_KEY):
+            raise TemplateError("Set {} of arguments in '{}' has not {} value"
+                                "".format(number, path, PROJECT_KEY))
+        for key, value in arguments.items():
+            if value is None or isinstance(value, (dict, list)):
+                raise TemplateError("Set {} of arguments in '{}' has invalid value of {}"
+                                    "".format(number, path, key))
+            arguments[key] = str(value)
+    return argument_sets
+
+
+class BatchGenerator:
+    """ Generator of many projects from one template. """
+
+    def __init__(self, template, jobs=1, force=False, staged=False):
+        self.template = template
+        self.jobs = jobs
+        self.force = force
+        self.staged = staged
+        self.__elements = list(template.elements)
+        self.__copied = {}
+
+    def __session(self, arguments):
+        """ Session with values of arguments for one project. """
+        values = {key: value for key, value in arguments.items() if key != PROJECT_KEY}
+        self.template.check_args(values)
+        name = os.path.basename(os.path.normpath(arguments[PROJECT_KEY]))
+        return self.template.manager.create_session(self.template, values, name)
+
+    def __content(self, element, session):
+        """
+        Rendered element, files which never depend on values are read once.
+
+        Content is shared only by binary files and files without any
+        placeholder, other files can use values of the next project.
+        """
+        content = self.__copied.get(element)
+        if content is None:
+            content = element.render_bytes(session)
+            if element.is_binary or element.info['placeholders'] == []:
+                self.__copied[element] = content
+        return content
+
+    def save_project(self, path, arguments):
+        """ Generate one project in path. Return number of written files. """
+        session = self.__session(arguments)
+        self.template.examine_save(path, force=self.force)
+        with ProjectWriter(path, staged=self.staged) as writer:
+            for element in self.__elements:
+                content = self.__content(element, session)
+                with writer.target(os.path.join(path, element.render_path(session))) as target:
+                    with open(target, "wb") as output:
+                        output.write(content)
+        return len(self.__elements)
+
+    def save(self, argument_sets, path=""):
+        """
+        Generate project for every set of arguments.
+
+        Paths of projects are relative to ``path``. Projects are reported
+        in order of sets and the error of the first failed project is
+        raised. Return Counter with number of files in every project.
+        """
+        argument_sets = list(argument_sets)
+        paths = [os.path.join(path, arguments[PROJECT_KEY]) for arguments in argument_sets]
+        if self.jobs is None or self.jobs <= 1 or len(paths) < 2:
+            results = map(self.save_project, paths, argument_sets)
+        else:
+            # first project compiles elements, next ones share them
+            results = [self.save_project(paths[0], argument_sets[0])]
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                futures = [executor.submit(self.save_project, project_path, arguments)
+                           for project_path, arguments in zip(paths[1:], argument_sets[1:])]
+            results.extend(future.result() for future in futures)
+        stats = Counter()
+        for project_path, files in zip(paths, results):
+            print("save project: ", project_path)
+            stats[project_path] = files
+        logging.info("Saved %d projects with %d files", len(stats), sum(stats.values()))
+        return stats
+
+
+def save_batch(template, argument_sets, path="", jobs=1, force=False, staged=False):
+    """ Generate projects from template for every set of arguments. """
+    return BatchGenerator(template, jobs=jobs, force=force, staged=staged) \
+        .save(argument_sets, path)
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Benchmarks of templateme module.
+
+Benchmarks measure cost of the most expensive parts of template
+generation. To run all of them call::
+
+    python -m templateme.benchmarks
+
+Results can be printed as JSON (``--json``), so they can be compared
+between versions. Size of synthesized templates is set by options, see
+``python -m templateme.benchmarks --help``.
+"""
+
+import os
+import io
+import sys
+import json
+import shutil
+import timeit
+import fnmatch
+import tempfile
+import subprocess
+from contextlib import redirect_stdout
+from templateme.ignore import IgnoreMatcher
+from templateme.renderer import compile_text
+
+# Names of benchmarks run by default.
+BENCHMARKS = ("render", "ignore", "tree", "backends", "startup")
+
+
+def replace_render(text, values):
+    """ Render text by replacing every argument in whole text. """
+    result = text
+    for name in values:
+        result = result.replace("%{}%".format(name), values[name])
+    return result
+
+
+def synthesize_text(size, args_count):
+    """ Create text of given size with placeholders of arguments. """
+    line = "some literal text of the template "
+    lines = []
+    length = 0
+    index = 0
+    while length < size:
+        new_line = "{}%ARG{}%\n".format(line, index % args_count)
+        lines.append(new_line)
+        length += len(new_line)
+        index += 1
+    return "".join(lines)
+
+
+def bench_render(size=1000000, args_count=200, repeat=3):
+    """
+    Compare rendering by replacing with rendering of compiled text.
+
+    Replacing scans text once for every argument, so its time grows with
+    the number of arguments. Compiled text is rendered with one join.
+    """
+    values = {}
+    for index in range(args_count):
+        values["ARG{}".format(index)] = "value{}".format(index)
+    text = synthesize_text(size, args_count)
+    compiled = compile_text(text, values)
+    assert compiled.render(values) == replace_render(text, values)
+    return {
+        'name': 'render',
+        'size': len(text),
+        'args': args_count,
+        'replace': min(timeit.repeat(lambda: replace_render(text, values),
+                                     number=1, repeat=repeat)),
+        'compile': min(timeit.repeat(lambda: compile_text(text, values),
+                                     number=1, repeat=repeat)),
+        'render': min(timeit.repeat(lambda: compiled.render(values),
+                                    number=1, repeat=repeat))
+    }
+
+
+def fnmatch_ignored(full_path, patterns):
+    """ Tell if path is ignored by matching every pattern with fnmatch. """
+    for pattern in patterns:
+        if fnmatch.fnmatch(full_path, "*/" + pattern):
+            return True
+    return False
+
+
+def bench_ignore(files=100000, repeat=3):
+    """ Compare fnmatch of every ignore pattern with compiled matcher. """
+    patterns = ['manifest.json', '*.swp', "__pycache__", '*.pyc', '.git',
+                '*.tmp', 'build/*', '*~']
+    extensions = ["py", "pyc", "txt", "swp", "json", "c", "h", "tmp"]
+    paths = ["/templates/tpl/dir{}/sub{}/file{}.{}".format(index % 97, index % 13, index,
+                                                           extensions[index % len(extensions)])
+             for index in range(files)]
+    matcher = IgnoreMatcher(patterns)
+    expected = [fnmatch_ignored(path, patterns) for path in paths]
+    assert [matcher.match(path) for path in paths] == expected
+    return {
+        'name': 'ignore',
+        'files': files,
+        'patterns': len(patterns),
+        'fnmatch': min(timeit.repeat(lambda: [fnmatch_ignored(path, patterns)
+                                              for path in paths],
+                                     number=1, repeat=repeat)),
+        'matcher': min(timeit.repeat(lambda: [matcher.match(path) for path in paths],
+                                     number=1, repeat=repeat))
+    }
+
+
+def bench_startup(argv=("--list",), repeat=5):
+    """ Measure time of console program started in new interpreter. """
+    command = [sys.executable, "-m", "templateme"] + list(argv)
+
+    def run_program():
+        """ Run console program once. """
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+
+    return {
+        'name': 'startup',
+        'argv': " ".join(argv),
+        'time': min(timeit.repeat(run_program, number=1, repeat=repeat))
+    }
+
+
+def synthesize_tree(path, templates=10, files=100, depth=2, size=4096, args_count=10,
+                    include_depth=1):
+    """
+    Create directory with templates.
+
+    Files of every template are placed in directories nested ``depth``
+    levels deep. Templates are joined in chains of ``include_depth``
+    includes: every template includes the previous one in its chain.
+    Return list of names of templates.
+    """
+    names = ["template{}".format(index) for index in range(templates)]
+    text = synthesize_text(size, args_count)
+    for index, name in enumerate(names):
+        template_path = os.path.join(path, name)
+        os.makedirs(template_path)
+        manifest = {
+            'description': "Synthesized template {}".format(index),
+            'args': [{'name': "arg{}".format(number)} for number in range(args_count)],
+            'include': [names[index - 1]] if index % (include_depth + 1) else []
+        }
+        with open(os.path.join(template_path, "manifest.json"), "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+        synthesize_files(template_path, name, files, depth, text)
+    return names
+
+
+def synthesize_files(path, name, files, depth, text):
+    """ Create files of template in directories nested ``depth`` levels deep. """
+    for number in range(files):
+        directory = os.path.join(path, *["level{}_{}".format(level, number % 3)
+                                         for level in range(depth)])
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "{}_file{}.txt".format(name, number)),
+                  "w") as element_file:
+            element_file.write(text)
+
+
+def tree_manager(path):
+    """ Manager with templates only from package and path. """
+    from templateme.containers.path import PathSource
+    from templateme.manager import TMPManager
+    manager = TMPManager(name="benchmark", debug=True)
+    source = PathSource(manager, path)
+    manager.plugins.append(source)
+    return manager, source
+
+
+def save_quietly(template, path, **kwargs):
+    """ Save template in path without printing, then remove it. """
+    with redirect_stdout(io.StringIO()):
+        template.save(path, "project", force=True, **kwargs)
+    shutil.rmtree(path)
+
+
+def bench_tree(templates=10, files=100, depth=2, size=4096, args_count=10,
+               include_depth=1, repeat=3):
+    """
+    Measure phases of generation for synthesized tree of templates.
+
+    Templates are searched, listed and rendered by new objects in every
+    run, so caches of templates are not used. Measured template has the
+    longest chain of includes.
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        templates_path = os.path.join(directory, "templates")
+        name = synthesize_tree(templates_path, templates, files, depth, size, args_count,
+                               include_depth)[min(include_depth, templates - 1)]
+
+        def list_templates():
+            """ Search all templates in directory. """
+            return tree_manager(templates_path)[1].get_all_templates()
+
+        def list_elements():
+            """ Search elements of template with includes. """
+            return tree_manager(templates_path)[1].get_template(name).elements
+
+        template = tree_manager(templates_path)[1].get_template(name)
+        template.args.add_values({"arg{}".format(index): "value{}".format(index)
+                                  for index in range(args_count)})
+        text = template.elements[0].load_txt()
+        return {
+            'name': 'tree',
+            'templates': templates,
+            'files': files,
+            'depth': depth,
+            'size': size,
+            'args': args_count,
+            'include_depth': include_depth,
+            'elements': len(template.elements),
+            'get_all_templates': min(timeit.repeat(list_templates, number=1, repeat=repeat)),
+            'list_elements': min(timeit.repeat(list_elements, number=1, repeat=repeat)),
+            'render_template_txt': min(timeit.repeat(
+                lambda: template.manager.render_template_txt(text, template),
+                number=1, repeat=repeat)),
+            'save': min(timeit.repeat(
+                lambda: save_quietly(template, os.path.join(directory, "output")),
+                number=1, repeat=repeat))
+        }
+    finally:
+        shutil.rmtree(directory)
+
+
+def bench_backends(files=2000, size=16384, jobs=4, repeat=3):
+    """ Compare saving of large template serially, by threads and by processes. """
+    directory = tempfile.mkdtemp()
+    try:
+        synthesize_files(os.path.join(directory, "templates", "large"), "large", files, 1,
+                         synthesize_text(size, 10))
+        template = tree_manager(os.path.join(directory, "templates"))[1].get_template("large")
+        template.args.add_values({"ARG{}".format(index): "value{}".format(index)
+                                  for index in range(10)})
+        output = os.path.join(directory, "output")
+
+        def save(jobs, backend):
+            """ Save template in new directory. """
+            save_quietly(template, output, jobs=jobs, backend=backend)
+
+        return {
+            'name': 'backends',
+            'files': files,
+            'size': size,
+            'jobs': jobs,
+            'serial': min(timeit.repeat(lambda: save(1, "threads"), number=1, repeat=repeat)),
+            'threads': min(timeit.repeat(lambda: save(jobs, "threads"),
+                                         number=1, repeat=repeat)),
+            'processes': min(timeit.repeat(lambda: save(jobs, "processes"),
+                                           number=1, repeat=repeat))
+        }
+    finally:
+        shutil.rmtree(directory)
+
+
+def run_all(names=BENCHMARKS, **tree_options):
+    """
+    Run benchmarks with names.
+
+    ``tree_options`` are arguments of :func:`bench_tree`.
+    """
+    results = []
+    if "render" in names:
+        for args_count in (10, 100, 1000):
+            results.append(bench_render(args_count=args_count))
+    if "ignore" in names:
+        results.append(bench_ignore())
+    if "tree" in names:
+        results.append(bench_tree(**tree_options))
+    if "backends" in names:
+        results.append(bench_backends())
+    if "startup" in names:
+        for argv in (["--version"], ["--short-list"], ["--list"]):
+            results.append(bench_startup(argv))
+    return results
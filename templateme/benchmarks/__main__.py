@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+CommandLine interface for benchmarks.
+
+For running benchmarks call::
+
+    python -m templateme.benchmarks
+
+To save results of chosen benchmarks as JSON call e.g.::
+
+    python -m templateme.benchmarks --json -b tree --files 1000 > results.json
+"""
+
+import json
+import platform
+from argparse import ArgumentParser
+from templateme import get_version
+from templateme.benchmarks import BENCHMARKS
+from templateme.benchmarks import run_all
+
+
+def __option_args(argv=None):
+    """ Parsing argument for benchmarks. """
+    parser = ArgumentParser(description="Measure cost of template generation",
+                            prog='templateme.benchmarks')
+    parser.add_argument("-b", "--benchmark", action="append", dest="names",
+                        choices=BENCHMARKS, default=None,
+                        help="Run only chosen benchmarks")
+    parser.add_argument("--json", action="store_true", dest="json", default=False,
+                        help="Print results as JSON")
+    parser.add_argument("--templates", type=int, default=10,
+                        help="Number of synthesized templates")
+    parser.add_argument("--files", type=int, default=100,
+                        help="Number of files in every template")
+    parser.add_argument("--depth", type=int, default=2,
+                        help="Depth of directories in templates")
+    parser.add_argument("--size", type=int, default=4096,
+                        help="Size of every file in bytes")
+    parser.add_argument("--args", type=int, dest="args_count", default=10,
+                        help="Number of arguments of every template")
+    parser.add_argument("--include-depth", type=int, dest="include_depth", default=1,
+                        help="Length of chains of included templates")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Number of runs, the best time is reported")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """ Run benchmarks and print results. """
+    options = __option_args(argv)
+    results = run_all(options.names or BENCHMARKS, templates=options.templates,
+                      files=options.files, depth=options.depth, size=options.size,
+                      args_count=options.args_count, include_depth=options.include_depth,
+                      repeat=options.repeat)
+    if options.json:
+        print(json.dumps({'version': get_version(),
+                          'python': platform.python_version(),
+                          'results': results}, indent=2, sort_keys=True))
+        return
+    for result in results:
+        print(" * {}".format(", ".join("{}: {}".format(key, value)
+                                       for key, value in sorted(result.items()))))
+
+
+if __name__ == "__main__":
+    main()
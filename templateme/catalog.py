@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Catalog of templates stored on disk.
+
+Catalog keeps names of templates in directories, parsed manifests, lists
+of template's elements and indexes of element's files (binary flag and
+placeholders) between calls of the program. Every entry is
+stored with stats of files and directories it was read from (modification
+time and inode) and is used only when the stats did not change. In other
+case the templates are read from disk again and the catalog is updated,
+entries of removed templates and files are removed with it.
+"""
+
+import os
+import json
+import hashlib
+import logging
+
+
+def default_path():
+    """ Path to catalog file in user's cache directory. """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_home, "templateme", "catalog.json")
+
+
+def stat_stamp(stat):
+    """ Stats which change when file or directory is modified. """
+    return [stat.st_mtime_ns, stat.st_ino, stat.st_size]
+
+
+def path_stamp(path):
+    """ Stats of file or directory which change when it is modified. """
+    try:
+        return stat_stamp(os.stat(path))
+    except OSError:
+        return None
+
+
+def directories_stamp(path, directories):
+    """ Hash of stats of all directories in template. """
+    digest = hashlib.sha1()
+    for directory in directories:
+        stamp = path_stamp(os.path.join(path, directory))
+        if stamp is None:
+            return None
+        digest.update("{}:{}\n".format(directory, stamp).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class Catalog:
+    """ Cache of templates from directories. """
+
+    VERSION = 2
+
+    def __init__(self, path=None):
+        self.path = path if path is not None else default_path()
+        self.__data = None
+        self.__dirty = False
+
+    @staticmethod
+    def __empty():
+        """ Data of empty catalog. """
+        return {'version': Catalog.VERSION, 'sources': {}, 'templates': {}, 'files': {}}
+
+    @property
+    def data(self):
+        """ Data of catalog, read from file on first use. """
+        if self.__data is None:
+            self.__data = Catalog.__empty()
+            try:
+                with open(self.path) as catalog_file:
+                    data = json.load(catalog_file)
+                if isinstance(data, dict) and data.get('version') == Catalog.VERSION:
+                    self.__data = data
+            except (OSError, ValueError):
+                logging.debug("Cannot read catalog [%s]", self.path)
+        return self.__data
+
+    def clear(self):
+        """ Forget all entries, they are read from disk again. """
+        self.__data = Catalog.__empty()
+        self.__dirty = True
+
+    def __entry(self, path):
+        """ Entry of template in directory. """
+        return self.data['templates'].setdefault(path, {})
+
+    def names(self, path):
+        """ Names of templates in directory, None if not valid. """
+        entry = self.data['sources'].get(path)
+        if entry is None or entry['stamp'] != path_stamp(path):
+            return None
+        return entry['names']
+
+    def set_names(self, path, names):
+        """
+        Store names of templates in directory.
+
+        Entries of templates which are not in directory any more are
+        removed with indexes of their files.
+        """
+        self.data['sources'][path] = {'stamp': path_stamp(path), 'names': names}
+        self.__dirty = True
+        kept = set(names)
+        self.__prune('templates', path, lambda relative: relative in kept)
+        self.__prune('files', path, lambda relative: relative.split(os.sep, 1)[0] in kept)
+
+    def __prune(self, section, directory, keep):
+        """
+        Remove entries of section for paths in directory which are not kept.
+
+        ``keep`` tells by path relative to directory if entry is kept.
+        """
+        prefix = os.path.join(directory, "")
+        entries = self.data[section]
+        for path in [path for path in entries if path.startswith(prefix)]:
+            if not keep(path[len(prefix):]):
+                del entries[path]
+
+    def manifest(self, path):
+        """
+        Data of template's manifest.
+
+        Return tuple ``(valid, data)``, where data is None for template
+        without manifest file.
+        """
+        entry = self.data['templates'].get(path, {}).get('manifest')
+        manifest_path = os.path.join(path, "manifest.json")
+        if entry is None or entry['stamp'] != path_stamp(manifest_path):
+            return False, None
+        return True, entry['data']
+
+    def set_manifest(self, path, data):
+        """ Store data of template's manifest. """
+        manifest_path = os.path.join(path, "manifest.json")
+        self.__entry(path)['manifest'] = {'stamp': path_stamp(manifest_path), 'data': data}
+        self.__dirty = True
+
+    def elements(self, path, ignored):
+        """ Relative paths of template's elements, None if not valid. """
+        entry = self.data['templates'].get(path, {}).get('elements')
+        if entry is None or entry['ignored'] != list(ignored):
+            return None
+        if entry['stamp'] != directories_stamp(path, entry['directories']):
+            return None
+        return entry['files']
+
+    def set_elements(self, path, ignored, directories, files):
+        """
+        Store elements of template with all directories of template.
+
+        Indexes of files which are not elements any more are removed.
+        """
+        self.__entry(path)['elements'] = {
+            'ignored': list(ignored),
+            'directories': directories,
+            'stamp': directories_stamp(path, directories),
+            'files': files
+        }
+        self.__dirty = True
+        kept = set(files)
+        self.__prune('files', path, lambda relative: relative in kept)
+
+    def element_info(self, path, stat=None):
+        """
+        Index of element's file, None if not valid.
+
+        Stats of the file are read from disk if they are not given.
+        """
+        entry = self.data['files'].get(path)
+        if entry is None:
+            return None
+        stamp = stat_stamp(stat) if stat is not None else path_stamp(path)
+        if entry['stamp'] != stamp:
+            return None
+        return entry['info']
+
+    def set_element_info(self, path, info, stat=None):
+        """ Store index of element's file. """
+        stamp = stat_stamp(stat) if stat is not None else path_stamp(path)
+        self.data['files'][path] = {'stamp': stamp, 'info': info}
+        self.__dirty = True
+
+    def save(self):
+        """ Write catalog to file if it was changed. """
+        if not self.__dirty:
+            return
+        temp_path = "{}.{}.tmp".format(self.path, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(temp_path, "w") as catalog_file:
+                json.dump(self.data, catalog_file)
+            os.replace(temp_path, self.path)
+            self.__dirty = False
+        except OSError as ex:
+            logging.warning("Cannot save catalog [%s]: %s", self.path, ex)
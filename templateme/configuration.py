@@ -23,6 +23,10 @@ author=user
 license=MIT
 ;; additional localizations separated by ':' sign
 templates=
+;; keep catalog of templates in user's cache directory (yes|no)
+cache=yes
+;; number of threads which save files of template
+jobs=1
     """
 
     def __init__(self, debug=False):
@@ -59,6 +63,21 @@ templates=
                     return config[section][key]
         return default
 
+    def get_bool(self, key, section="global", default=False):
+        """ Get value of yes/no option. """
+        value = self.get_val(key, section=section)
+        if value is None:
+            return default
+        return value.strip().lower() in ("yes", "y", "true", "on", "1")
+
+    def get_int(self, key, section="global", default=0):
+        """ Get value of integer option. """
+        value = self.get_val(key, section=section)
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
     @property
     def debug(self):
         """ Check if configuration is from debug. """
@@ -24,14 +24,14 @@ build templates.
 
 """
 
-import logging
+import os
 import sys
 from argparse import ArgumentParser
 from argparse import ArgumentTypeError
 from templateme import get_version
-from templateme.manager import TMPManager
-from templateme.containers.abstract import Template
-from templateme.containers.abstract import TemplateError
+
+# Manager, containers and logging are imported in functions which use them,
+# so --version and --help do not pay for loading of templates.
 
 
 def __option_args(argv=None):
@@ -82,6 +82,36 @@ def __option_args(argv=None):
     parser.add_argument("-f", "--force", action="store_true",
                         dest="force", default=False,
                         help="Force save template")
+    parser.add_argument("-u", "--update", action="store_true",
+                        dest="update", default=False,
+                        help="Update existing project, write only changed files")
+    parser.add_argument("-b", "--batch", metavar="FILE",
+                        dest="batch", default=None,
+                        help="Create project for every set of arguments from CSV or JSONL "
+                             "file, in directory given by --out")
+    parser.add_argument("--format", metavar="FORMAT", dest="format", default="dir",
+                        choices=["dir", "tar", "tar.gz", "tar.bz2", "tar.xz", "zip"],
+                        help="Save project in directory (default) or in archive")
+    parser.add_argument("--staged", action="store_true",
+                        dest="staged", default=False,
+                        help="Write new project in temporary directory and move it when done")
+    parser.add_argument("-j", "--jobs", metavar="N", type=int,
+                        dest="jobs", default=None,
+                        help="Number of threads or processes which save files")
+    parser.add_argument("--processes", action="store_true",
+                        dest="processes", default=False,
+                        help="Save files by pool of processes instead of threads, "
+                             "one for every CPU unless --jobs is given")
+    parser.add_argument("--rebuild-cache", action="store_true",
+                        dest="rebuild_cache", default=False,
+                        help="Read all templates again instead of cached catalog")
+    parser.add_argument("--timings", metavar="FILE", nargs="?", const="",
+                        dest="timings", default=None,
+                        help="Print times of generation phases, "
+                             "FILE gets folded stacks for flame graph")
+    parser.add_argument("--profile", metavar="FILE",
+                        dest="profile", default=None,
+                        help="Save statistics of cProfile to FILE")
     return parser.parse_args(argv)
 
 
@@ -108,6 +138,7 @@ def examine_save(template, project_name, force):
     Check if template exists and you can save it.
     If not, ask about confirmation to do this.
     """
+    from templateme.containers.abstract import TemplateError
     if force or project_name is None:
         return
     try:
@@ -124,33 +155,76 @@ def examine_save(template, project_name, force):
             raise
 
 
-def main(argv=None, debug=False):
-    """
-    Main function for command line program.
+def __jobs(options, manager):
+    """ Number of threads or processes which save files. """
+    if options.jobs is not None:
+        return options.jobs
+    if options.processes:
+        return os.cpu_count() or 1
+    return manager.config.get_int("jobs", default=1)
+
+
+def __save_batch(options, manager, template):
+    """ Save template for every set of arguments from batch file. """
+    from templateme.batch import read_argument_sets
+    from templateme.batch import save_batch
+    from templateme.containers.abstract import TemplateError
+    try:
+        save_batch(template, read_argument_sets(options.batch),
+                   path=options.project_name or "", jobs=__jobs(options, manager),
+                   force=options.force, staged=options.staged)
+    except (TemplateError, OSError, ValueError) as ex:
+        print("Cannot save: ", ex)
+        sys.exit(2)
+
+
+def __save(options, manager, template, save_path, force):
+    """ Save template in project's directory or archive. """
+    if options.format != "dir" and save_path is not None:
+        root = os.path.basename(save_path)[:-len(options.format) - 1]
+        template.save_archive(save_path, options.format, project_name=root, force=force)
+        print("save archive: ", save_path)
+        return
+    stats = template.save(options.project_name, options.project_name, force=force,
+                          jobs=__jobs(options, manager), incremental=options.update,
+                          staged=options.staged,
+                          backend="processes" if options.processes else "threads")
+    if options.update and stats is not None:
+        print("created: {}, updated: {}, unchanged: {}"
+              "".format(stats["created"], stats["updated"], stats["unchanged"]))
+
+
+def __list(options, manager):
+    """ Print list of templates or chosen template and exit. """
+    import logging
+    from templateme.containers.abstract import TemplateError
+    if options.template == "":
+        templates = manager.get_all_templates()
+        print("Here's a list of all templates:\n")
+        for temp in templates:
+            if options.short_list:
+                print("{} ".format(temp))
+                continue
+            try:
+                print(" * {} - {}".format(temp, temp.short_description))
+            except TemplateError:
+                logging.warning("Cannot read template [%s]", temp)
+        sys.exit(0)
+    template = manager.get_template(options.template)
+    try:
+        print_template(template)
+    except TemplateError as ex:
+        print("Cannot read template: ", ex)
+        sys.exit(2)
+    sys.exit(0)
 
-    @param argv: Option parameters
-    @type argv: list
-    """
-    options = __option_args(argv)
-    logging.basicConfig(format='%(asctime)s - %(name)s - '
-                               '%(levelname)s - %(message)s',
-                        level=options.logLevel)
-    manager = TMPManager(options.project_name, debug=debug)
 
+def __run(options, manager):
+    """ Run command for parsed options. """
+    from templateme.containers.abstract import Template
+    from templateme.containers.abstract import TemplateError
     if options.list or options.short_list:
-        if options.template == "":
-            templates = manager.get_all_templates()
-            print("Here's a list of all templates:\n")
-            for temp in templates:
-                if options.short_list:
-                    print("{} ".format(temp))
-                else:
-                    print(" * {} - {}".format(temp, temp.short_description))
-            sys.exit(0)
-        else:
-            template = manager.get_template(options.template)
-            print_template(template)
-            sys.exit(0)
+        __list(options, manager)
     elif options.template == "":
         print("You should define template's name\nSee --help for more information")
         sys.exit(1)
@@ -161,21 +235,68 @@ def main(argv=None, debug=False):
         print("There are not template name: ", options.template)
         sys.exit(1)
     force = options.force
-    template.args.add_values_from_list(options.argvalues)
     try:
+        template.args.add_values_from_list(options.argvalues)
+        if options.batch is not None:
+            __save_batch(options, manager, template)
+            return
+        save_path = options.project_name
+        if options.format != "dir" and save_path is not None:
+            from templateme.archive import archive_path
+            save_path = archive_path(save_path, options.format)
         if not options.quite:
-            examine_save(template, options.project_name, force)
+            examine_save(template, save_path, force or options.update)
 
             # if examine was confirmed that you want to save template,
             # you can rewrite it even on existing files.
             force = True
 
             template.args.input_missing()
-        template.save(options.project_name, options.project_name, force=force)
+        __save(options, manager, template, save_path, force)
     except TemplateError as ex:
         print("Cannot save: ", ex)
         sys.exit(2)
 
 
+def main(argv=None, debug=False):
+    """
+    Main function for command line program.
+
+    @param argv: Option parameters
+    @type argv: list
+    """
+    options = __option_args(argv)
+    import logging
+    from templateme.manager import TMPManager
+    logging.basicConfig(format='%(asctime)s - %(name)s - '
+                               '%(levelname)s - %(message)s',
+                        level=options.logLevel)
+    manager = TMPManager(options.project_name, debug=debug,
+                         rebuild_cache=options.rebuild_cache)
+    timings = None
+    if options.timings is not None:
+        from templateme.timings import Timings
+        timings = Timings()
+        manager.add_hook(timings)
+    profile = None
+    if options.profile:
+        import cProfile
+        profile = cProfile.Profile()
+        profile.enable()
+
+    try:
+        with manager.timer.phase("run"):
+            __run(options, manager)
+    finally:
+        manager.save_catalog()
+        if profile is not None:
+            profile.disable()
+            profile.dump_stats(options.profile)
+        if timings is not None:
+            print(timings.report(), file=sys.stderr)
+            if options.timings:
+                timings.save_folded(options.timings)
+
+
 if __name__ == "__main__":
     main()
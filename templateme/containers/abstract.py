@@ -3,10 +3,66 @@
 Module with abstract classes.
 """
 import fnmatch
+import functools
+import copy
+import io
 import abc
+import shutil
+import logging
+from collections import Counter
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 import os
 import re
+import time
 from templateme.arguments import empty_args
+from templateme.ignore import IgnoreMatcher
+from templateme.renderer import compile_text
+from templateme.renderer import render_stream
+from templateme.renderer import index_source
+from templateme.renderer import is_binary_head
+from templateme.renderer import render_indexed
+from templateme.renderer import SNIFF_SIZE
+from templateme.renderer import RENDERED
+from templateme.renderer import COPIED
+from templateme.renderer import BINARY
+from templateme.renderer import TextOutput
+from templateme.renderer import output_encoding
+from templateme.digest import DigestOutput
+from templateme.digest import text_output
+from templateme.digest import source_digest
+from templateme.digest import file_digest
+from templateme.writer import ProjectWriter
+from templateme.timings import NO_TIMER
+
+
+BINARY_EXTENSIONS = frozenset([
+    '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.webp', '.tif', '.tiff',
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.tar', '.jar', '.whl',
+    '.pdf', '.ttf', '.otf', '.woff', '.woff2', '.eot',
+    '.so', '.dll', '.exe', '.bin', '.o', '.a', '.pyc', '.class',
+    '.mp3', '.mp4', '.ogg', '.wav', '.avi', '.mov', '.sqlite', '.db'
+])
+
+# Changes of project's files made by incremental TMPElement.write.
+CREATED = "created"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+
+
+def saved_message(save_path, status):
+    """ Message about saved file. """
+    if status == UNCHANGED:
+        return "unchanged file:  {}".format(save_path)
+    return "save file:  {}".format(save_path)
+
+
+def template_timer(template):
+    """ Timer of hooks of template's manager, see :mod:`templateme.timings`. """
+    if template.manager is None:
+        return NO_TIMER
+    return template.manager.timer
 
 
 class TemplateError(Exception):
@@ -16,47 +72,310 @@ class TemplateError(Exception):
 class TMPElement(abc.ABC):
     """ Class with one of files in template. """
     def __init__(self, path, template, project_name="project"):
-        self._format = ""
+        self._compiled = None
+        self._info = None
+        self._compiled_path = None
+        self._rendered_path = (None, None)
         self.path = path
         self.template = template
         self.project_name = project_name
+        # path of source file, None if element is not a file on disk
+        self.source_path = None
 
     @classmethod
     def load_txt(cls):
         """ Load text. """
         raise NotImplementedError
 
+    @classmethod
+    def open_source(cls):
+        """ Open source text of element as text file, new lines are not changed. """
+        raise NotImplementedError
+
+    @classmethod
+    def open_binary(cls):
+        """ Open source of element as binary file. """
+        raise NotImplementedError
+
+    def copy_source(self, save_path):
+        """ Copy source of element to save_path without rendering. """
+        with self.open_binary() as source, open(save_path, "wb") as output:
+            shutil.copyfileobj(source, output)
+
     @property
-    def text(self):
-        """ Element text. """
-        if self._format == "":
-            self._format = self.template.manager.render_template_txt(self.load_txt(), self.template)
-        return self._format
+    def size(self):
+        """ Size of element's source in bytes. """
+        with self.open_binary() as source:
+            return source.seek(0, io.SEEK_END)
+
+    def _stored_info(self):
+        """ Index of element's source kept by earlier run, None if it is not kept. """
+        return self._info
+
+    def _store_info(self, info):
+        """ Keep index of element's source for later runs. """
+
+    def __known_info(self):
+        """ Index of element's source if it is known without reading the source. """
+        if self._info is None:
+            self._info = self._stored_info()
+        return self._info
+
+    def __set_info(self, info):
+        """ Remember index of element's source. """
+        self._info = info
+        self._store_info(info)
+
+    @property
+    def info(self):
+        """
+        Index of element's source, built on first use.
+
+        Dictionary with ``binary`` flag and ``placeholders``, the names
+        which can be replaced in the source (None if not known).
+        """
+        if self.__known_info() is None:
+            with self.open_binary() as source:
+                self.__set_info(index_source(source))
+        return self._info
+
+    @property
+    def is_binary(self):
+        """
+        True if element is binary file which is copied without rendering.
+
+        Element is binary when it matches ``binary`` patterns of manifest,
+        has extension of binary file or its beginning is not UTF-8 text.
+        """
+        return self.template.is_binary_path(self.path) or self.info['binary']
+
+    def used_values(self, session):
+        """
+        Values of arguments which are placeholders in element.
+
+        Return None when the index cannot tell which arguments are used.
+        """
+        placeholders = self.info['placeholders']
+        if placeholders is None or not session.indexable:
+            return None
+        values = session.values
+        return {name: values[name] for name in placeholders if name in values}
+
+    def copy(self, template):
+        """ Copy of element which belongs to another template. """
+        element = copy.copy(self)
+        element.template = template
+        return element
+
+    def compiled_text(self, names):
+        """ Element text compiled for arguments with names. """
+        names = frozenset(names)
+        compiled = self._compiled
+        if compiled is None or compiled.names != names:
+            compiled = self._compiled = compile_text(self.load_txt(), names)
+        return compiled
+
+    def render_path(self, session):
+        """
+        Path of element rendered in session.
+
+        Path is compiled once and the rendered path is remembered together
+        with values of arguments used in it.
+        """
+        compiled = self._compiled_path
+        if compiled is None or compiled.names != session.names:
+            compiled = self._compiled_path = compile_text(self.path, session.names)
+        key = tuple(session.values[name] for name in sorted(compiled.placeholders))
+        rendered_key, rendered = self._rendered_path
+        if rendered_key != key:
+            rendered = compiled.render(session.values)
+            self._rendered_path = (key, rendered)
+        return rendered
+
+    def _session(self, session):
+        """ Session given or a new one for template of element. """
+        if session is None:
+            session = self.template.manager.create_session(self.template)
+        return session
 
     @property
     def save_path(self):
         """ Path to save element in output directory. """
-        return self.template.manager.render_template_txt(self.path, self.template)
+        return self.render_path(self._session(None))
 
-    def print_element(self):
+    def print_element(self, session=None):
         """ Print path and source of element. """
+        session = self._session(session)
+        if self.is_binary:
+            source = "(binary file)"
+        else:
+            source = self.compiled_text(session.names).render(session.values)
         print("{selector}\n{el_path}\n{selector}\n{el_source}\n{selector}\n\n"
               "".format(selector="--------",
-                        el_path=self.save_path,
-                        el_source=self.text))
+                        el_path=self.render_path(session),
+                        el_source=source))
 
-    def save(self, path, project_name="project"):
+    def save(self, path, project_name="project", session=None, incremental=False):
         """ Save element in project. """
-        save_path = os.path.join(path, self.save_path)
+        save_path, status = self.write(path, project_name=project_name, session=session,
+                                       incremental=incremental)
+        print(saved_message(save_path, status))
+        return status
+
+    def write(self, path, project_name="project", session=None, incremental=False,
+              writer=None):
+        """
+        Write element in project.
+
+        Source is rendered in chunks straight to the output file, so
+        neither source nor rendered text is kept in memory. File is
+        written by ``writer`` shared by elements of project (new
+        :class:`ProjectWriter` if it is not given). Return tuple
+        with path of written file and the way it was written. In
+        ``incremental`` mode existing file is written only when it
+        changed and the status is :data:`CREATED`, :data:`UPDATED` or
+        :data:`UNCHANGED`.
+        """
+        session = self._session(session)
+        save_path = os.path.join(path, self.render_path(session))
         save_path = re.sub(r"/^{}/".format(self.template.name), project_name, save_path)
+        if writer is None:
+            writer = ProjectWriter(path)
+        timer = template_timer(self.template)
+        start = time.perf_counter()
+        status = change = self.__change_of(save_path, session) if incremental else None
+        written = 0
+        if change != UNCHANGED:
+            with writer.target(save_path) as target_path:
+                status = self.render_to(target_path, session)
+                if timer.hooks:
+                    written = os.path.getsize(target_path)
+        if timer.hooks:
+            timer.element(save_path, self.size, written, time.perf_counter() - start)
+        return save_path, change or status
+
+    def __change_of(self, save_path, session):
+        """
+        Tell how writing of element would change the file.
+
+        Return :data:`CREATED`, :data:`UPDATED` or :data:`UNCHANGED`.
+        """
         try:
-            os.makedirs(os.path.dirname(save_path))
-        except FileExistsError:
-            pass
-        file = open(save_path, "w")
-        file.write(self.text)
-        file.close()
-        print("save file: ", save_path)
+            size = os.path.getsize(save_path)
+        except OSError:
+            return CREATED
+        if self.__is_written(save_path, size, session):
+            return UNCHANGED
+        return UPDATED
+
+    def __is_written(self, save_path, size, session):
+        """
+        Tell if file with size has the same content as rendered element.
+
+        Sizes are compared first, so the existing file is read only when
+        its size is the same.
+        """
+        status, values = self.__render_values(session)
+        if status != RENDERED:
+            if self.size != size:
+                return False
+            with self.open_binary() as source:
+                digest = source_digest(source)
+        else:
+            output = DigestOutput()
+            with self.open_source() as source, text_output(output) as text:
+                render_stream(source, text, values)
+                text.flush()
+                digest = output.size, output.hexdigest()
+            if digest[0] != size:
+                return False
+        return file_digest(save_path) == digest
+
+    def render_to(self, output, session):
+        """
+        Render element with values of session to file.
+
+        ``output`` is path of file or binary file object. Binary files and
+        files without placeholders are copied, other files are rendered
+        only with values of arguments they use. Return :data:`BINARY`,
+        :data:`COPIED` or :data:`RENDERED`.
+        """
+        if self.__known_info() is None and not self.template.is_binary_path(self.path):
+            return self.__render_indexed(output, session)
+        status, values = self.__render_values(session)
+        if status != RENDERED:
+            if isinstance(output, str):
+                self.copy_source(output)
+            else:
+                with self.open_binary() as source:
+                    shutil.copyfileobj(source, output)
+            return status
+        if not isinstance(output, str):
+            with self.open_source() as source:
+                render_stream(source, TextOutput(output), values)
+            return RENDERED
+        with self.open_source() as source, open(output, "w", newline="") as text:
+            render_stream(source, text, values)
+        return RENDERED
+
+    def __render_indexed(self, output, session):
+        """
+        Render element to file and build index of its source meanwhile.
+
+        Text source is read once, source which is binary by its beginning
+        is copied. Return the same status as :meth:`render_to` with
+        known index.
+        """
+        with self.open_binary() as source:
+            head = source.read(SNIFF_SIZE)
+            if is_binary_head(head):
+                info = {'binary': True, 'placeholders': []}
+            elif isinstance(output, str):
+                with open(output, "w", newline="") as text:
+                    info = render_indexed(source, head, text, session.values)
+            else:
+                info = render_indexed(source, head, TextOutput(output), session.values)
+        self.__set_info(info)
+        if info['binary']:
+            return self.render_to(output, session)
+        return self.render_status(session)
+
+    def render_status(self, session):
+        """
+        Way in which element is written in session.
+
+        Return :data:`BINARY`, :data:`COPIED` or :data:`RENDERED`.
+        """
+        return self.__render_values(session)[0]
+
+    def render_bytes(self, session=None):
+        """
+        Element rendered with values of session.
+
+        Return bytes which would be written to the element's file.
+        """
+        session = self._session(session)
+        status, _ = self.__render_values(session)
+        if status != RENDERED:
+            with self.open_binary() as source:
+                return source.read()
+        text = self.compiled_text(session.names).render(session.values)
+        return text.encode(output_encoding())
+
+    def __render_values(self, session):
+        """
+        Way in which element is written and values used to render it.
+
+        Values are None for copied files.
+        """
+        if self.is_binary:
+            return BINARY, None
+        values = self.used_values(session)
+        if values is None:
+            return RENDERED, session.values
+        if not values:
+            return COPIED, None
+        return RENDERED, values
 
 
 class Template(abc.ABC):
@@ -65,27 +384,48 @@ class Template(abc.ABC):
         self.manager = manager
         self._name = name
 
-        self._ignored = ['manifest.json', '*.swp', "__pycache__", '*.pyc']
+        self._ignored = ['manifest.json', '*.swp', "__pycache__", '*.pyc', '.git']
+        self._ignore_matcher = None
         self._include_templates = None
+        self._include_order = None
         self._all_args = None
+        self._elements = None
         self._all_elements = None
+        self._binary_patterns = None
         self.__args = None
         self.__args_updated = False
-        self._includes = []
-        self.manifest = manifest
+        self._manifest = manifest
+        self._manifest_loaded = manifest is not None
+
+    @property
+    def manifest(self):
+        """ Manifest of template, loaded on first use. """
+        if not self._manifest_loaded:
+            with template_timer(self).phase("manifest"):
+                self._manifest = self._load_manifest()
+            self._manifest_loaded = True
+        return self._manifest
+
+    def _load_manifest(self):
+        """ Load manifest of template, None if template has not manifest. """
+        return self._manifest
+
+    @property
+    def _includes(self):
+        """ Names of included templates. """
         if self.manifest:
-            for include in self.manifest.include:
-                self._includes.append(include)
-            self.__args = manifest.args
-        else:
-            self.__args = empty_args()
+            return self.manifest.include
+        return []
 
     @property
     def args(self):
         """ Arguments with manifest updated file. """
+        if self.__args is None:
+            self.__args = self.manifest.args if self.manifest else empty_args()
         if not self.__args_updated:
-            for inc in self.include_templates:
-                self.__args.update(inc.args)
+            for inc in self.included:
+                if inc.manifest:
+                    self.__args.update(inc.manifest.args)
             self.__args_updated = True
         return self.__args
 
@@ -98,14 +438,42 @@ class Template(abc.ABC):
             self._ignored.append(args)
         else:
             raise AttributeError("Argument should have type 'list' or 'str'")
+        self._ignore_matcher = None
 
-    def _is_ignored(self, full_path):
-        """ Tell if path file is ignored. """
-        for ignor in self._ignored:
-            if fnmatch.fnmatch(full_path, "*/" + ignor):
+    @property
+    def ignored(self):
+        """ Ignore patterns of template, with patterns from manifest. """
+        if self.manifest:
+            return self._ignored + self.manifest.ignore
+        return list(self._ignored)
+
+    @property
+    def binary_patterns(self):
+        """ Patterns of binary files from manifests of template and includes. """
+        if self._binary_patterns is None:
+            result = []
+            for template in [self] + self.included:
+                if template.manifest:
+                    result.extend(template.manifest.binary)
+            self._binary_patterns = result
+        return self._binary_patterns
+
+    def is_binary_path(self, path):
+        """ Tell if element with path is binary file by its name. """
+        if os.path.splitext(path)[1].lower() in BINARY_EXTENSIONS:
+            return True
+        name = os.path.basename(path)
+        for pattern in self.binary_patterns:
+            if fnmatch.fnmatch(path, pattern) or fnmatch.fnmatch(name, pattern):
                 return True
         return False
 
+    def _is_ignored(self, full_path):
+        """ Tell if path of file or directory is ignored. """
+        if self._ignore_matcher is None:
+            self._ignore_matcher = IgnoreMatcher(self.ignored)
+        return self._ignore_matcher.match(full_path)
+
     def __str__(self):
         return self._name
 
@@ -129,18 +497,96 @@ class Template(abc.ABC):
             self._include_templates = result
         return self._include_templates
 
+    @property
+    def included(self):
+        """
+        All templates included by template, directly or by other includes.
+
+        Every template is listed once, even if a few templates include it,
+        and it is placed after all templates which include it. Graph of
+        includes is walked once. Raise TemplateError if included template
+        is not found or includes are cyclic.
+        """
+        if self._include_order is None:
+            self._include_order = self.__walk_includes()[1:]
+        return self._include_order
+
+    def __walk_includes(self):
+        """ Template with all included templates in topological order. """
+        order = []
+        done = set()
+        path = []
+
+        def visit(template):
+            """ Add template after all templates which it includes. """
+            if template in done:
+                return
+            if template in path:
+                cycle = path[path.index(template):] + [template]
+                raise TemplateError("Cyclic include of templates: {}".format(
+                    " -> ".join(str(node) for node in cycle)))
+            path.append(template)
+            names = template.manifest.include if template.manifest else []
+            for name, inc in reversed(list(zip(names, template.include_templates))):
+                if inc is None:
+                    raise TemplateError("Template '{}' includes unknown template '{}'"
+                                        .format(template, name))
+                visit(inc)
+            path.pop()
+            done.add(template)
+            order.append(template)
+
+        visit(self)
+        return order[::-1]
+
+    @property
+    def own_elements(self):
+        """ Elements of template without included templates, searched once. """
+        if self._elements is None:
+            with template_timer(self).phase("elements"):
+                self._elements = list(self._get_elements())
+        return self._elements
+
     @property
     def elements(self):
-        """ List of all template's elements. """
+        """
+        List of all template's elements.
+
+        Elements are searched once, together with elements of all included
+        templates. Template included a few times by other includes gives
+        its elements once. Call :meth:`invalidate` to search them again.
+        """
         if self._all_elements is None:
-            result = self._get_elements()
-            for inc in self.include_templates:
-                for element in inc.elements:
-                    element.template = self
-                    result.append(element)
-            return result
+            result = list(self.own_elements)
+            for inc in self.included:
+                for element in inc.own_elements:
+                    result.append(element.copy(self))
+            self._all_elements = result
         return self._all_elements
 
+    def invalidate(self, seen=None):
+        """
+        Forget elements and manifest of template and all included templates.
+
+        Manifest is loaded again on next use, with binary and ignore
+        patterns from it. ``seen`` is set of already invalidated templates,
+        so every template is invalidated once, even with cyclic includes.
+        """
+        seen = set() if seen is None else seen
+        seen.add(self)
+        if self._include_templates is not None:
+            for inc in self._include_templates:
+                if inc is not None and inc not in seen:
+                    inc.invalidate(seen)
+        self._include_templates = None
+        self._include_order = None
+        self._elements = None
+        self._all_elements = None
+        self._manifest_loaded = False
+        self._binary_patterns = None
+        self._ignore_matcher = None
+        self.__args_updated = False
+
     @property
     def short_description(self):
         """ Return short description. """
@@ -160,28 +606,200 @@ class Template(abc.ABC):
         """ Check if template can be save. """
         if force:
             return
-        if os.path.isdir(path):
+        if os.path.exists(path):
             raise TemplateError("File '{}' already exist".format(path))
 
+    def check_args(self, arguments=None):
+        """
+        Check if values of all arguments are set or given in ``arguments``.
+
+        Raise TemplateError with the first missing argument.
+        """
+        names = [key.upper() for key in (arguments or {})]
+        missing = [argument for argument in self.args.missing_args if argument.name not in names]
+        if missing:
+            raise TemplateError("cannot set {} arguments. First is [{}]"
+                                "".format(len(missing), missing[0]))
+
     def print_elements(self):
         """ Print elements on the screen. """
+        session = self.manager.create_session(self)
         for element in self.elements:
-            element.print_element()
+            element.print_element(session)
 
-    def save(self, path, project_name=None, force=False):
-        """ Save template in path. """
-        if self.args.missing_args:
-            raise TemplateError("cannot set {} arguments. First is [{}]"
-                                "".format(len(self.args.missing_args),
-                                          self.args.missing_args[0]))
+    def save(self, path, project_name=None, force=False, jobs=1, incremental=False,
+             staged=False, backend="threads"):
+        """
+        Save template in path.
+
+        With ``jobs`` greater than 1 elements are rendered and written by
+        pool of threads, or by pool of processes for ``backend`` set to
+        ``"processes"`` (except ``incremental`` mode, which always uses
+        threads). Saved files are reported in order of elements and
+        the error of the first failed element is raised. With ``staged``
+        new project is written in temporary directory which is moved to
+        the path when all files are saved.
+
+        Return Counter with number of files saved in every way
+        (:data:`RENDERED`, :data:`COPIED` and :data:`BINARY`). In
+        ``incremental`` mode the template is saved over existing project,
+        only changed files are written and Counter has numbers of
+        :data:`CREATED`, :data:`UPDATED` and :data:`UNCHANGED` files.
+        """
+        self.check_args()
         if project_name == "":
             project_name = self.name
         elif project_name is None:
             self.print_elements()
-            return
-        self.examine_save(path, force=force)
-        for element in self.elements:
-            element.save(path, project_name=project_name)
+            return None
+        self.examine_save(path, force=force or incremental)
+        stats = Counter()
+        session = self.manager.create_session(self)
+        with template_timer(self).phase("save"), ProjectWriter(path, staged=staged) as writer:
+            if jobs is None or jobs <= 1:
+                results = (element.write(path, project_name=project_name, session=session,
+                                         incremental=incremental, writer=writer)
+                           for element in self.elements)
+            elif backend == "processes" and not incremental:
+                results = self.__save_processes(path, session, writer, jobs)
+            else:
+                results = self.__save_threads(path, project_name, session, writer, jobs,
+                                              incremental)
+            for save_path, status in results:
+                writer.report(saved_message(save_path, status))
+                stats[status] += 1
+        if incremental:
+            logging.info("Saved %d files: %d created, %d updated, %d unchanged",
+                         sum(stats.values()), stats[CREATED], stats[UPDATED],
+                         stats[UNCHANGED])
+        else:
+            logging.info("Saved %d files: %d rendered, %d without placeholders copied, "
+                         "%d binary copied", sum(stats.values()), stats[RENDERED],
+                         stats[COPIED], stats[BINARY])
+        return stats
+
+    def render(self, arguments=None, project_name=None, lazy=False):
+        """
+        Render template in memory.
+
+        Return mapping with relative path and bytes of every project's file,
+        the same as saved on disk. ``arguments`` and ``project_name`` are
+        used like in :meth:`TMPManager.create_session`, template is not
+        changed. With ``lazy`` files are rendered on first access.
+        """
+        self.check_args(arguments)
+        session = self.manager.create_session(self, arguments, project_name)
+        tree = RenderedTree(self.elements, session)
+        if lazy:
+            return tree
+        with template_timer(self).phase("render"):
+            return dict(tree.items())
+
+    def __save_threads(self, path, project_name, session, writer, jobs, incremental):
+        """ Write elements by pool of threads, return results in order of elements. """
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(template_timer(self).inherit(element.write), path,
+                                       project_name=project_name, session=session,
+                                       incremental=incremental, writer=writer)
+                       for element in self.elements]
+        return [future.result() for future in futures]
+
+    def __process_tasks(self, path, session):
+        """
+        Saved paths of elements and tasks of processes.
+
+        Every task has index of element, path of its source file, rendered
+        path and flag which tells if the file is binary by its name.
+        Source files are not read here.
+        """
+        save_paths = []
+        tasks = []
+        for index, element in enumerate(self.elements):
+            relative_path = element.render_path(session)
+            save_paths.append(os.path.join(path, relative_path))
+            if element.source_path is not None:
+                tasks.append((index, element.source_path, relative_path,
+                              self.is_binary_path(element.path)))
+        return save_paths, tasks
+
+    def __save_processes(self, path, session, writer, jobs):
+        """
+        Write elements by pool of processes.
+
+        Processes get paths of files and values of arguments, elements
+        which are not files on disk are written by this process. Return
+        list of saved paths and statuses, in order of elements.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        from templateme import processes
+        save_paths, tasks = self.__process_tasks(path, session)
+        sizes = [self.elements[task[0]].size for task in tasks]
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(processes.save_chunk, writer.root, dict(session.values),
+                                       [tasks[index] for index in chunk])
+                       for chunk in processes.balanced_chunks(sizes, jobs)]
+            # elements which are not files on disk are written meanwhile
+            statuses = {index: element.write(path, session=session, writer=writer)[1]
+                        for index, element in enumerate(self.elements)
+                        if element.source_path is None}
+            for future in futures:
+                statuses.update(future.result())
+        return [(save_path, statuses[index]) for index, save_path in enumerate(save_paths)]
+
+    def save_archive(self, output, archive_format="tar.gz", project_name=None, force=False):
+        """
+        Save template in archive.
+
+        ``output`` is path of archive file or binary file object, files
+        are added in ``project_name`` directory (name of template by
+        default). Formats are listed in
+        :data:`templateme.archive.ARCHIVE_FORMATS`. Return Counter like
+        :meth:`save`.
+        """
+        # archive modules are loaded only when they are used
+        from templateme.archive import ArchiveWriter
+        self.check_args()
+        if isinstance(output, str):
+            self.examine_save(output, force=force)
+        stats = Counter()
+        session = self.manager.create_session(self)
+        root = self.name if project_name is None else project_name
+        with template_timer(self).phase("archive"), \
+                ArchiveWriter(output, archive_format, root=root) as archive:
+            for element in self.elements:
+                render = functools.partial(element.render_to, session=session)
+                stats[archive.add(element.render_path(session), render)] += 1
+        logging.info("Archived %d files: %d rendered, %d without placeholders copied, "
+                     "%d binary copied", sum(stats.values()), stats[RENDERED],
+                     stats[COPIED], stats[BINARY])
+        return stats
+
+
+class RenderedTree(Mapping):
+    """
+    Read only mapping with files of project rendered in memory.
+
+    Paths of files are rendered when the tree is created, contents on
+    first access.
+    """
+
+    def __init__(self, elements, session):
+        self.session = session
+        self.__elements = OrderedDict((element.render_path(session), element)
+                                      for element in elements)
+        self.__rendered = {}
+
+    def __getitem__(self, path):
+        content = self.__rendered.get(path)
+        if content is None:
+            content = self.__rendered[path] = self.__elements[path].render_bytes(self.session)
+        return content
+
+    def __iter__(self):
+        return iter(self.__elements)
+
+    def __len__(self):
+        return len(self.__elements)
 
 
 class TMPSource(abc.ABC):
@@ -190,6 +808,7 @@ class TMPSource(abc.ABC):
     def __init__(self, manager):
         self.manager = manager
         self._templates = None
+        self._index = None
 
     @classmethod
     def get_all_templates(cls):
@@ -203,10 +822,17 @@ class TMPSource(abc.ABC):
             self._templates = self.get_all_templates()
         return self._templates
 
+    @property
+    def index(self):
+        """ Dictionary of templates by name. """
+        if self._index is None:
+            index = {}
+            for template in self.templates:
+                assert isinstance(template, Template)
+                index.setdefault(template.name, template)
+            self._index = index
+        return self._index
+
     def get_template(self, name):
         """ Get one of templates by id. """
-        for template in self.templates:
-            if template.name == name:
-                assert isinstance(template, Template)
-                return template
-        return None
+        return self.index.get(name)
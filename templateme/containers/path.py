@@ -3,6 +3,7 @@
 Module for template from path.
 """
 import os
+import shutil
 import logging
 import templateme
 from templateme.manifest import Manifest
@@ -10,74 +11,173 @@ from templateme.manifest import ManifestError
 import templateme.containers.abstract
 
 
-class TemplateError(Exception):
+class TemplateError(templateme.containers.abstract.TemplateError):
     """ Problem with template. """
 
 
 class PathElement(templateme.containers.abstract.TMPElement):
     """ Class with template's element file from path. """
 
-    def __init__(self, path, localization, template):
+    def __init__(self, path, localization, template, catalog=None, stat=None):
         templateme.containers.abstract.TMPElement.__init__(self, path, template)
         self.localization = localization
+        self.source_path = localization
         self._load_txt = ""
+        self.__catalog = catalog
+        self.stat = stat
+
+    @property
+    def size(self):
+        """ Size of element's file. """
+        if self.stat is not None:
+            return self.stat.st_size
+        return os.path.getsize(self.localization)
+
+    def _stored_info(self):
+        """ Index of file from catalog, None if the file changed. """
+        if self.__catalog is None:
+            return None
+        return self.__catalog.element_info(self.localization, stat=self.stat)
+
+    def _store_info(self, info):
+        """ Keep index of file in catalog. """
+        if self.__catalog is not None:
+            self.__catalog.set_element_info(self.localization, info, stat=self.stat)
 
     def load_txt(self):
         """ Load information from file. """
         if self._load_txt == "":
-            with open(self.localization) as file_ob:
+            with open(self.localization, newline="") as file_ob:
                 self._load_txt = file_ob.read()
         return self._load_txt
 
+    def open_source(self):
+        """ Open file of element, new lines are not changed. """
+        return open(self.localization, newline="")
+
+    def open_binary(self):
+        """ Open file of element in binary mode. """
+        return open(self.localization, "rb")
+
+    def copy_source(self, save_path):
+        """ Copy file by operating system, without reading it in python. """
+        shutil.copyfile(self.localization, save_path)
+
 
 class PathTemplate(templateme.containers.abstract.Template):
     """ Class with template from path. """
 
-    def __init__(self, path, name, manager):
-        manifest = None
+    def __init__(self, path, name, manager, catalog=None, record_stats=False):
+        templateme.containers.abstract.Template.__init__(self, name, manager)
+        self._path = os.path.join(path, name)
+        self.__catalog = catalog
+        self.__record_stats = record_stats
+
+    def _load_manifest(self):
+        """ Load manifest from template's directory. """
+        if self.__catalog is not None:
+            valid, data = self.__catalog.manifest(self._path)
+            if valid:
+                return Manifest(data, self) if data is not None else None
         try:
-            manifest = Manifest.create_from_file(os.path.join(path, name, "manifest.json"), self)
+            manifest = Manifest.create_from_file(os.path.join(self._path, "manifest.json"), self)
         except ManifestError:
-            pass
+            manifest = None
         except PermissionError as ex:
             logging.warning("Cannot read manifest file from %s,\n"
-                            "Please try change permissions", path)
+                            "Please try change permissions", self._path)
             raise TemplateError("Permission error", ex)
-        templateme.containers.abstract.Template.__init__(self, name, manager, manifest)
-        self._path = os.path.join(path, name)
+        if self.__catalog is not None:
+            self.__catalog.set_manifest(self._path, manifest.data if manifest else None)
+        return manifest
+
+    def __scan(self, relative, directories):
+        """
+        Generate files of directory and its subdirectories.
+
+        Yield tuples with relative path of file and its ``os.DirEntry``.
+        Ignored directories are not searched and, like in ``os.walk``,
+        symbolic links to directories are not followed. Relative paths of
+        searched directories are added to ``directories``.
+        """
+        directories.append(relative or os.curdir)
+        subdirectories = []
+        for entry in list(os.scandir(os.path.join(self._path, relative))):
+            if self._is_ignored(entry.path):
+                continue
+            if not entry.is_dir():
+                yield os.path.join(relative, entry.name), entry
+            elif not entry.is_symlink():
+                subdirectories.append(entry.name)
+        for name in subdirectories:
+            yield from self.__scan(os.path.join(relative, name), directories)
 
     def _get_elements(self):
-        elements = []
-        for root, _, files in os.walk(self._path):
-            for name in files:
-                full_path = os.path.join(root, name)
-                if self._is_ignored(full_path):
-                    continue
-                path_element = os.path.relpath(full_path, self._path)
-                element = PathElement(path_element, full_path, self)
-                elements.append(element)
-        return elements
+        """
+        Generate elements of template.
+
+        Elements are taken from catalog or found by scanning directories,
+        one by one. With ``record_stats`` the stats of scanned files are
+        kept in elements, so they are not read again.
+        """
+        files = None
+        if self.__catalog is not None:
+            files = self.__catalog.elements(self._path, self.ignored)
+        if files is not None:
+            for path_element in files:
+                yield PathElement(path_element, os.path.join(self._path, path_element), self,
+                                  catalog=self.__catalog)
+            return
+        directories = []
+        files = []
+        for path_element, entry in self.__scan("", directories):
+            files.append(path_element)
+            yield PathElement(path_element, entry.path, self, catalog=self.__catalog,
+                              stat=entry.stat() if self.__record_stats else None)
+        if self.__catalog is not None:
+            self.__catalog.set_elements(self._path, self.ignored, directories, files)
 
 
 class PathSource(templateme.containers.abstract.TMPSource):
     """ Class with path source from directory. """
 
-    def __init__(self, manager, path):
+    def __init__(self, manager, path, catalog=None, record_stats=None):
         templateme.containers.abstract.TMPSource.__init__(self, manager)
         self._path = path
+        self.__catalog = catalog
+        # stats of files are needed to check entries of catalog
+        self.__record_stats = catalog is not None if record_stats is None else record_stats
+        self.__created = {}
+
+    def __template(self, name):
+        """ Template object with name, created once for the source. """
+        if name not in self.__created:
+            self.__created[name] = PathTemplate(self._path, name, self.manager,
+                                                catalog=self.__catalog,
+                                                record_stats=self.__record_stats)
+        return self.__created[name]
 
     def get_all_templates(self):
         """ Return all templates from directory. """
         logging.debug("Path source, get_templates [%s]", self._path)
-        templates = []
-        logging.debug(self._path)
-        templates_path = os.listdir(self._path)
-        for temp_file in templates_path:
-            if not os.path.isdir(os.path.join(self._path, temp_file)):
-                continue
-            try:
-                templates.append(PathTemplate(self._path, temp_file, self.manager))
-            except TemplateError:
-                logging.warning("Problem with template crated [%s]"
-                                "", os.path.join(self._path, temp_file))
-        return templates
+        names = None
+        if self.__catalog is not None:
+            names = self.__catalog.names(self._path)
+        if names is None:
+            names = []
+            for temp_file in os.listdir(self._path):
+                if os.path.isdir(os.path.join(self._path, temp_file)):
+                    names.append(temp_file)
+            if self.__catalog is not None:
+                self.__catalog.set_names(self._path, names)
+        return [self.__template(name) for name in names]
+
+    def get_template(self, name):
+        """ Get template by name without listing the directory. """
+        if self._index is not None:
+            return self._index.get(name)
+        if name in ("", os.curdir, os.pardir) or os.sep in name:
+            return None
+        if not os.path.isdir(os.path.join(self._path, name)):
+            return None
+        return self.__template(name)
@@ -1,10 +1,18 @@
 #!/usr/bin/env python3
 """
 Module for template from resource.
+
+Resources are read with ``importlib.resources``, so templates work also
+when the package is installed as a zip file.
 """
 from os.path import join
+import io
 import logging
-import pkg_resources
+from pathlib import Path
+try:
+    from importlib.resources import files as resource_files
+except ImportError:  # python < 3.9
+    from importlib_resources import files as resource_files
 import templateme
 from templateme.manifest import Manifest
 from templateme.manifest import ManifestError
@@ -14,57 +22,64 @@ import templateme.containers.abstract
 class ResourceElement(templateme.containers.abstract.TMPElement):
     """ Class with template's element file from path. """
 
-    def __init__(self, path, template, localization, name):
+    def __init__(self, path, template, resource):
         templateme.containers.abstract.TMPElement.__init__(self, path, template)
-        self.localization = localization
+        self.resource = resource
+        if isinstance(resource, Path):
+            self.source_path = str(resource)
         self.__load_txt = None
-        self.name = name
 
     def load_txt(self):
         """ Load information from file. """
         if self.__load_txt is None:
-            full_path = join(self.localization, self.name, self.path)
-            self.__load_txt = pkg_resources.resource_string("templateme", full_path).decode("utf-8")
+            self.__load_txt = self.resource.read_bytes().decode("utf-8")
         return self.__load_txt
 
+    def open_source(self):
+        """ Open resource of element, new lines are not changed. """
+        return io.TextIOWrapper(self.open_binary(), encoding="utf-8", newline="")
+
+    def open_binary(self):
+        """ Open resource of element in binary mode. """
+        return self.resource.open("rb")
+
 
 class ResourceTemplate(templateme.containers.abstract.Template):
     """ Class with template from path. """
 
     def __init__(self, name, manager, package_localization="templates"):
-        manifest = None
+        templateme.containers.abstract.Template.__init__(self, name, manager)
+        self.__package_localization = package_localization
+        self.__resource = resource_files("templateme") / package_localization / name
+
+    def _load_manifest(self):
+        """ Load manifest from package's resources. """
+        manifest_resource = self.__resource / "manifest.json"
+        if not manifest_resource.is_file():
+            return None
         try:
-            manifest_path = join(package_localization, name, "manifest.json")
-            json_str = pkg_resources.resource_string("templateme", manifest_path)
-            manifest = Manifest.create_from_string(json_str.decode("utf-8"), self)
+            json_str = manifest_resource.read_bytes()
+            return Manifest.create_from_string(json_str.decode("utf-8"), self)
         except ManifestError:
-            pass
-        templateme.containers.abstract.Template.__init__(self, name, manager, manifest)
-        self.__package_localization = package_localization
+            return None
 
-    def __search_in_dir(self, package_localization, name, path_in, elements):
+    def __search_in_dir(self, resource, path_in, elements):
         """ Search in directory. """
-        where_look = join(package_localization, name)
-        where_look = join(where_look, path_in)
-        for directory_name in pkg_resources.resource_listdir("templateme", where_look):
-            directory_path = join(where_look, directory_name)
-            if self._is_ignored(directory_path):
+        where_look = join(self.__package_localization, self.name, path_in)
+        for child in resource.iterdir():
+            if self._is_ignored(join(where_look, child.name)):
                 continue
-            if pkg_resources.resource_isdir("templateme", directory_path):
-                self.__search_in_dir(package_localization,
-                                     name,
-                                     join(path_in, directory_name),
-                                     elements)
+            if child.is_dir():
+                self.__search_in_dir(child, join(path_in, child.name), elements)
             else:
-                resource_element = ResourceElement(join(path_in, directory_name),
+                resource_element = ResourceElement(join(path_in, child.name),
                                                    self,
-                                                   package_localization,
-                                                   name)
+                                                   child)
                 elements.append(resource_element)
 
     def _get_elements(self):
         elements = []
-        self.__search_in_dir(self.__package_localization, self.name, "", elements)
+        self.__search_in_dir(self.__resource, "", elements)
         return elements
 
 
@@ -74,11 +89,30 @@ class ResourceSource(templateme.containers.abstract.TMPSource):
     def __init__(self, manager, source_dir="templates"):
         templateme.containers.abstract.TMPSource.__init__(self, manager)
         self.__templates_elem = source_dir
+        self.__resource = resource_files("templateme") / source_dir
+        self.__created = {}
+
+    def __template(self, name):
+        """ Template object with name, created once for the source. """
+        if name not in self.__created:
+            self.__created[name] = ResourceTemplate(name, self.manager, self.__templates_elem)
+        return self.__created[name]
 
     def get_all_templates(self):
         """ Return all templates from directory. """
         templates = []
         logging.debug(self.__templates_elem)
-        for temp_name in pkg_resources.resource_listdir("templateme", self.__templates_elem):
-            templates.append(ResourceTemplate(temp_name, self.manager, self.__templates_elem))
+        for resource in self.__resource.iterdir():
+            if resource.is_dir():
+                templates.append(self.__template(resource.name))
         return templates
+
+    def get_template(self, name):
+        """ Get template by name without listing the resources. """
+        if self._index is not None:
+            return self._index.get(name)
+        if name in ("", ".", "..") or "/" in name:
+            return None
+        if not (self.__resource / name).is_dir():
+            return None
+        return self.__template(name)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Module to compare output of template with existing files.
+
+Files of project are compared by size first and by digest of content
+only when sizes are the same. Rendered text is not kept in memory: it is
+written to :class:`DigestOutput`, which counts size and digest of bytes
+the same way as they would be written to the file.
+"""
+
+import io
+import hashlib
+
+CHUNK_SIZE = 65536
+
+
+class DigestOutput(io.RawIOBase):
+    """ Binary output which counts size and digest of written bytes. """
+
+    def __init__(self):
+        io.RawIOBase.__init__(self)
+        self.size = 0
+        self.__digest = hashlib.sha1()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.size += len(data)
+        self.__digest.update(data)
+        return len(data)
+
+    def hexdigest(self):
+        """ Digest of written bytes. """
+        return self.__digest.hexdigest()
+
+
+def text_output(output):
+    """
+    Text output to binary output.
+
+    Encoding is the same as in file opened by ``open(path, "w")``, new
+    lines are not changed.
+    """
+    return io.TextIOWrapper(output, newline="")
+
+
+def source_digest(source, chunk_size=CHUNK_SIZE):
+    """ Size and digest of file opened in binary mode. """
+    output = DigestOutput()
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        output.write(chunk)
+    return output.size, output.hexdigest()
+
+
+def file_digest(path, chunk_size=CHUNK_SIZE):
+    """ Size and digest of file in path. """
+    with open(path, "rb") as source:
+        return source_digest(source, chunk_size)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Module to match ignored files of template.
+
+Ignore pattern is a shell pattern which is matched with the end of file's
+path (``*/`` + pattern), e.g. ``*.pyc`` or ``__pycache__``. Patterns are
+compiled once: plain names and extensions are checked in sets and all
+other patterns are joined into one regular expression.
+"""
+
+import re
+import fnmatch
+
+WILDCARDS = frozenset("*?[")
+
+
+class IgnoreMatcher:
+    """ Compiled list of ignore patterns. """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.__names = set()
+        self.__suffixes = []
+        expressions = []
+        for pattern in self.patterns:
+            if "/" not in pattern and not WILDCARDS.intersection(pattern):
+                self.__names.add(pattern)
+            elif pattern.startswith("*") and "/" not in pattern and \
+                    not WILDCARDS.intersection(pattern[1:]):
+                self.__suffixes.append(pattern[1:])
+            else:
+                expressions.append(fnmatch.translate("*/" + pattern))
+        self.__suffixes = tuple(self.__suffixes)
+        self.__expression = None
+        if expressions:
+            self.__expression = re.compile("|".join(expressions))
+
+    def match(self, full_path):
+        """ Tell if path of file or directory is ignored. """
+        _, separator, name = full_path.rpartition("/")
+        if not separator:
+            return False
+        if name in self.__names:
+            return True
+        if self.__suffixes and name.endswith(self.__suffixes):
+            return True
+        if self.__expression is not None:
+            return self.__expression.match(full_path) is not None
+        return False
@@ -4,10 +4,12 @@ Module of template's manager.
 """
 import os
 import logging
-import datetime
 from templateme.containers.resource import ResourceSource
 from templateme.containers.path import PathSource
 from templateme.configuration import Configuration
+from templateme.catalog import Catalog
+from templateme.renderer import RenderSession
+from templateme.timings import Timer
 
 
 class TMPManagerError(Exception):
@@ -17,9 +19,17 @@ class TMPManagerError(Exception):
 class TMPManager:
     """ Template manager. """
 
-    def __init__(self, name="Project", debug=False):
+    def __init__(self, name="Project", debug=False, rebuild_cache=False):
         self.plugins = []
+        self.hooks = []
+        self.timer = Timer(self.hooks)
+        self.__registry = None
         self.__config = Configuration(debug=debug)
+        self.catalog = None
+        if not debug and self.__config.get_bool("cache", default=True):
+            self.catalog = Catalog()
+            if rebuild_cache:
+                self.catalog.clear()
 
         self.__register_sources()
         self.name = name
@@ -35,38 +45,93 @@ class TMPManager:
         for template_path in template_path_tab:
             template_path = os.path.expanduser(template_path)
             if os.path.isdir(template_path):
-                path_source = PathSource(manager=self, path=template_path)
+                path_source = PathSource(manager=self, path=template_path,
+                                         catalog=self.catalog)
                 self.plugins.append(path_source)
 
+    def add_hook(self, hook):
+        """
+        Add hook which measures phases of generation.
+
+        Hook is an object like :class:`templateme.timings.Hook`.
+        """
+        self.hooks.append(hook)
+
+    @property
+    def config(self):
+        """ Configuration of manager. """
+        return self.__config
+
+    def save_catalog(self):
+        """ Save catalog of templates for next calls. """
+        if self.catalog is not None:
+            self.catalog.save()
+
+    @property
+    def registry(self):
+        """
+        Dictionary of templates by name from all of containers.
+
+        When the same name is in a few containers, template from the first
+        registered container is used (package, /etc, ~/.config and
+        configured localizations).
+        """
+        if self.__registry is None:
+            registry = {}
+            for plug in self.plugins:
+                for name, template in plug.index.items():
+                    registry.setdefault(name, template)
+            self.__registry = registry
+        return self.__registry
+
     def get_all_templates(self):
         """ Return all of available templates from all of containers. """
         result = []
-        for plug in self.plugins:
-            logging.debug("get_all_templates [%s]", plug)
-            for temp in plug.get_all_templates():
-                result.append(temp)
+        with self.timer.phase("discovery"):
+            for plug in self.plugins:
+                logging.debug("get_all_templates [%s]", plug)
+                result.extend(plug.templates)
         return result
 
     def get_template(self, name):
         """ Return template by name. """
-        template = None
-        for plug in self.plugins:
-            template = plug.get_template(name)
-            if template is not None:
-                break
-        return template
+        if self.__registry is not None:
+            return self.__registry.get(name)
+        with self.timer.phase("discovery"):
+            for plug in self.plugins:
+                template = plug.get_template(name)
+                if template is not None:
+                    return template
+        return None
 
-    def render_template_txt(self, txt, template):
-        """ Rendering template to text format. """
-        result = txt
-        changes = {
+    def builtin_values(self):
+        """ Values of arguments which are available in every template. """
+        import datetime
+        return {
             'EMAIL': self.__config.get_val('email'),
             'AUTHOR': self.__config.get_val('author'),
             'YEAR': datetime.datetime.now().strftime("%Y"),
             'NAME': self.name if self.name is not None else "console"
         }
-        template.args.add_values(changes)
-        for key in template.args.all:
-            elem = template.args.get_argument(key)
-            result = result.replace("%{}%".format(elem.name), elem.value)
-        return result
+
+    def create_session(self, template, arguments=None, project_name=None):
+        """
+        Create session to render template.
+
+        Values of template's arguments and builtin values are read once.
+        ``arguments`` overrides them without changing the template, and
+        ``project_name`` is used as the NAME argument.
+        """
+        values = {}
+        for elem in template.args.all.values():
+            values[elem.name] = elem.value
+        values.update(self.builtin_values())
+        for key, value in (arguments or {}).items():
+            values[key.upper()] = value
+        if project_name is not None:
+            values['NAME'] = project_name
+        return RenderSession(values)
+
+    def render_template_txt(self, txt, template):
+        """ Rendering template to text format. """
+        return self.create_session(template).render(txt)
@@ -30,6 +30,12 @@ class Manifest:
         self.template = template
         if not isinstance(self.include, list):
             self.include = [self.include]
+        self.binary = self._read_argument("binary", [])
+        if not isinstance(self.binary, list):
+            self.binary = [self.binary]
+        self.ignore = self._read_argument("ignore", [])
+        if not isinstance(self.ignore, list):
+            self.ignore = [self.ignore]
 
         self.args = ArgumentsContainer(self._read_argument("args", []))
 
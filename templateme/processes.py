@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Module to save template by pool of processes.
+
+Rendering is pure Python work, so threads do not speed it up for
+templates with many files. Here elements are split into chunks with
+similar total size of files, one for every process. Processes get only
+paths of files and the table of argument's values, not objects of
+template or manager, and write rendered files straight to the project.
+"""
+
+import os
+import shutil
+from templateme.renderer import RenderSession
+from templateme.renderer import is_binary_head
+from templateme.renderer import render_indexed
+from templateme.renderer import SNIFF_SIZE
+from templateme.renderer import RENDERED
+from templateme.renderer import COPIED
+from templateme.renderer import BINARY
+from templateme.writer import ProjectWriter
+
+
+def balanced_chunks(sizes, count):
+    """
+    Split indexes of items with sizes into chunks with similar total size.
+
+    The largest items are placed first, every one in the chunk with the
+    smallest total size. Indexes in chunks are sorted and empty chunks
+    are skipped.
+    """
+    chunks = [[] for _ in range(max(count, 1))]
+    totals = [0] * len(chunks)
+    for index in sorted(range(len(sizes)), key=lambda index: -sizes[index]):
+        smallest = totals.index(min(totals))
+        chunks[smallest].append(index)
+        totals[smallest] += sizes[index]
+    return [sorted(chunk) for chunk in chunks if chunk]
+
+
+def info_status(info, session):
+    """
+    Way in which file with index is written in session, like by
+    :meth:`TMPElement.render_status`.
+    """
+    if info['binary']:
+        return BINARY
+    placeholders = info['placeholders']
+    if placeholders is not None and session.indexable and \
+            session.names.isdisjoint(placeholders):
+        return COPIED
+    return RENDERED
+
+
+def save_file(source_path, target_path, session, binary=False):
+    """
+    Write file rendered in session and return the way it was written.
+
+    Text file is read once, its index is built while it is rendered.
+    Binary file is copied.
+    """
+    if not binary:
+        with open(source_path, "rb") as source:
+            head = source.read(SNIFF_SIZE)
+            if not is_binary_head(head):
+                with open(target_path, "w", newline="") as output:
+                    info = render_indexed(source, head, output, session.values)
+                return info_status(info, session)
+    shutil.copyfile(source_path, target_path)
+    return BINARY
+
+
+def save_chunk(root, values, tasks):
+    """
+    Write files of one chunk in project's directory.
+
+    Every task is a tuple with index of element, path of source file,
+    relative path of output file and flag which tells if the file is
+    binary by its name. Files are read only by processes. Return list of
+    tuples with index and the way the file was written.
+    """
+    session = RenderSession(values)
+    writer = ProjectWriter(root)
+    results = []
+    for index, source_path, relative_path, binary in tasks:
+        with writer.target(os.path.join(root, relative_path)) as target_path:
+            results.append((index, save_file(source_path, target_path, session, binary)))
+    return results
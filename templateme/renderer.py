@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Module to render template's text.
+
+Text of template's element is compiled once into the list of literal
+segments and placeholder names. Rendering of compiled text is a single
+join of that list, so its cost depends only on the length of the text
+and not on the number of template's arguments.
+"""
+
+import re
+import codecs
+import locale
+from types import MappingProxyType
+
+PLACEHOLDER_PATTERN = re.compile(r"%([^%]+)%")
+
+# Every possible placeholder in bytes of file, also overlapping ones.
+INDEX_PATTERN = re.compile(br"%(?=([^%\r\n]{1,128})%)")
+# Longest name of argument which can be found by the index.
+INDEX_NAME_SIZE = 128
+# Number of different placeholders above which the index is not kept.
+INDEX_LIMIT = 256
+# Size of the beginning of file which is checked to tell if it is binary.
+SNIFF_SIZE = 8192
+
+# Ways in which file is written: rendered with values of arguments, copied
+# because it has not placeholders or copied because it is binary.
+RENDERED = "rendered"
+COPIED = "copied"
+BINARY = "binary"
+
+
+class CompiledText:
+    """
+    Text split to literal and placeholder segments.
+
+    Segments on even positions are literal text, segments on odd
+    positions are names of arguments. Placeholders are found from the
+    left side, so text like ``%X%NAME%`` with unknown ``X`` still renders
+    the ``NAME`` argument.
+    """
+
+    def __init__(self, text, names):
+        self.names = frozenset(names)
+        self.__segments = CompiledText.__tokenize(text, self.names)
+
+    @staticmethod
+    def __tokenize(text, names):
+        """ Split text to literal and placeholder segments. """
+        segments = []
+        literal_start = 0
+        position = 0
+        search = PLACEHOLDER_PATTERN.search
+        while True:
+            match = search(text, position)
+            if match is None:
+                break
+            name = match.group(1)
+            if name in names:
+                segments.append(text[literal_start:match.start()])
+                segments.append(name)
+                literal_start = position = match.end()
+            else:
+                # closing sign can be the opening sign of next placeholder
+                position = match.end() - 1
+        segments.append(text[literal_start:])
+        return segments
+
+    @property
+    def placeholders(self):
+        """ Set of argument names used in the text. """
+        return frozenset(self.__segments[1::2])
+
+    def render(self, values):
+        """ Render text with values of arguments. """
+        if len(self.__segments) == 1:
+            return self.__segments[0]
+        result = self.__segments[:]
+        for index in range(1, len(result), 2):
+            result[index] = values[result[index]]
+        return "".join(result)
+
+
+class RenderSession:
+    """
+    Frozen values of arguments for one rendering of template.
+
+    Session is created once (e.g. for every :meth:`Template.save`) and
+    shared by all elements. Its values are read only, so the same session
+    can be used by many threads.
+    """
+
+    def __init__(self, values):
+        self.values = MappingProxyType(dict(values))
+        self.names = frozenset(self.values)
+        self.longest = max([len(name) for name in self.names] or [0])
+        # Names which can be found by index of placeholders.
+        self.indexable = self.longest <= INDEX_NAME_SIZE and \
+            not any("\n" in name or "\r" in name for name in self.names)
+
+    def render(self, text):
+        """ Render text with values of session. """
+        return compile_text(text, self.names).render(self.values)
+
+
+class TextOutput:
+    """
+    Text output which writes encoded text to binary file object.
+
+    Encoding is the same as in files opened by ``open(path, "w")``, new
+    lines are not changed.
+    """
+
+    def __init__(self, output, encoding=None):
+        self.output = output
+        self.encoding = encoding or output_encoding()
+
+    def write(self, text):
+        """ Write encoded text. """
+        return self.output.write(text.encode(self.encoding))
+
+
+def output_encoding():
+    """ Encoding of rendered files, the same as in ``open(path, "w")``. """
+    return locale.getpreferredencoding(False)
+
+
+def render_stream(source, output, values, chunk_size=65536):
+    """
+    Render text from source file to output file in chunks.
+
+    Only the part of text which can still be the beginning of placeholder
+    is kept between chunks, so memory does not depend on size of file.
+    Result is the same as rendering of compiled text.
+    """
+    longest = max([len(name) for name in values] or [0])
+    search = PLACEHOLDER_PATTERN.search
+    pending = ""
+    while True:
+        chunk = source.read(chunk_size)
+        buffer = pending + chunk
+        literal_start = 0
+        position = 0
+        while True:
+            match = search(buffer, position)
+            if match is None:
+                break
+            name = match.group(1)
+            if name in values:
+                output.write(buffer[literal_start:match.start()])
+                output.write(values[name])
+                literal_start = position = match.end()
+            else:
+                position = match.end() - 1
+        if not chunk:
+            output.write(buffer[literal_start:])
+            return
+        keep = buffer.rfind("%", position)
+        if keep == -1 or len(buffer) - keep >= longest + 2:
+            # the last sign cannot open placeholder of any argument
+            keep = len(buffer)
+        output.write(buffer[literal_start:keep])
+        pending = buffer[keep:]
+
+
+class PlaceholderIndex:
+    """
+    Names which can be placeholders in text file, found in its chunks.
+
+    Chunks of bytes are added in order of file and empty chunk ends the
+    file. Only the part of chunk which can be the beginning of placeholder
+    is kept until the next chunk.
+    """
+
+    def __init__(self):
+        self.__found = set()
+        self.__buffer = b""
+        # more different placeholders than INDEX_LIMIT were found
+        self.overflow = False
+
+    def add(self, chunk):
+        """ Find placeholders in the next chunk of file. """
+        if self.overflow:
+            return
+        buffer = self.__buffer + chunk
+        # placeholder which starts near the end can be finished in next chunk
+        decided = len(buffer) if not chunk else len(buffer) - INDEX_NAME_SIZE - 2
+        if b"%" in buffer:
+            for match in INDEX_PATTERN.finditer(buffer):
+                if match.start() >= decided:
+                    break
+                self.__found.add(match.group(1))
+            if len(self.__found) > INDEX_LIMIT:
+                self.overflow = True
+                self.__buffer = b""
+                return
+        self.__buffer = buffer[max(decided, 0):]
+
+    @property
+    def info(self):
+        """ Index of text file, like by :func:`index_source`. """
+        if self.overflow:
+            return {'binary': False, 'placeholders': None}
+        names = [name.decode("utf-8", "replace") for name in self.__found]
+        return {'binary': False, 'placeholders': sorted(names)}
+
+
+class IndexedSource:
+    """
+    UTF-8 text file which is indexed while it is read.
+
+    Bytes of ``source`` are added to ``index`` before they are decoded,
+    beginning from ``head`` which was already read from the source. New
+    lines are not changed, like in files opened with ``newline=""``.
+    """
+
+    def __init__(self, source, index, head=b""):
+        self.source = source
+        self.index = index
+        self.__head = head
+        self.__decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def read(self, size=-1):
+        """ Read text, empty text is returned at the end of file. """
+        while True:
+            chunk = self.__head or self.source.read(size)
+            self.__head = b""
+            self.index.add(chunk)
+            text = self.__decoder.decode(chunk, final=not chunk)
+            if text or not chunk:
+                return text
+
+
+def is_binary_head(head):
+    """ Tell if beginning of file is not UTF-8 text. """
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head)
+    except UnicodeDecodeError:
+        return True
+    return b"\0" in head
+
+
+def index_source(source, chunk_size=65536):
+    """
+    Index of source file opened in binary mode.
+
+    Return dictionary with ``binary`` flag (file is not UTF-8 text) and
+    ``placeholders``, list of every name which can be a placeholder in
+    the file. Placeholders are None when there are too many of them.
+    """
+    head = source.read(SNIFF_SIZE)
+    if is_binary_head(head):
+        return {'binary': True, 'placeholders': []}
+    index = PlaceholderIndex()
+    chunk = head
+    while chunk and not index.overflow:
+        index.add(chunk)
+        chunk = source.read(chunk_size)
+    index.add(b"")
+    return index.info
+
+
+def render_indexed(source, head, output, values):
+    """
+    Render text file to output and build its index meanwhile.
+
+    ``source`` is file opened in binary mode, ``head`` its beginning
+    already read (and checked by :func:`is_binary_head`). File is read
+    once. Return index of file like by :func:`index_source`.
+    """
+    index = PlaceholderIndex()
+    render_stream(IndexedSource(source, index, head), output, values)
+    return index.info
+
+
+def compile_text(text, names):
+    """ Compile text for arguments with names. """
+    return CompiledText(text, names)
+
+
+def render_text(text, values):
+    """ Render text with dictionary of argument's values. """
+    return compile_text(text, values).render(values)
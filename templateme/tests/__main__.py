@@ -13,6 +13,14 @@ from templateme.tests import TestTemplateMeModule
 from templateme.tests.console import TestConsoleModule
 from templateme.tests.templates import TestTemplatesModule
 from templateme.tests.arguments import TestArgumentsModule
+from templateme.tests.renderer import TestRendererModule
+from templateme.tests.catalog import TestCatalogModule
+from templateme.tests.aio import TestAioModule
+from templateme.tests.writer import TestWriterModule
+from templateme.tests.batch import TestBatchModule
+from templateme.tests.processes import TestProcessesModule
+from templateme.tests.benchmarks import TestBenchmarksModule
+from templateme.tests.timings import TestTimingsModule
 
 
 if __name__ == "__main__":
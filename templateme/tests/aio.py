@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Testing module aio.
+"""
+
+import os
+import shutil
+import asyncio
+import tempfile
+import threading
+import unittest
+import mock
+from templateme.aio import AsyncGenerator
+from templateme.containers.abstract import TemplateError
+from templateme.manager import TMPManager
+
+
+# This is tested class. Can have too many method
+class TestAioModule(unittest.TestCase):  # pylint: disable=R0904
+    """ Module testsCase. """
+
+    def setUp(self):
+        """ Setup environment. """
+        self.directory = tempfile.mkdtemp()
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        """ Teardown environment. """
+        self.loop.close()
+        shutil.rmtree(self.directory)
+
+    def test_concurrent_generation(self):
+        """ Test if one template is generated with different arguments at once. """
+        async def generate_all():
+            """ Generate a few projects concurrently. """
+            async with AsyncGenerator(TMPManager(debug=True), max_workers=4) as generator:
+                return await asyncio.gather(*[
+                    generator.generate("cpp", os.path.join(self.directory, str(index)),
+                                       {'class': "Class{}".format(index)})
+                    for index in range(5)])
+
+        results = self.loop.run_until_complete(generate_all())
+        for index, files in enumerate(results):
+            self.assertEqual(len(files), 4)
+            header = os.path.join(self.directory, str(index), "lib",
+                                  "Class{}.h".format(index))
+            self.assertIn(header, files)
+            with open(header) as header_file:
+                self.assertIn("Class{}".format(index), header_file.read())
+
+    def test_missing_arguments(self):
+        """ Test if generation without required arguments fails. """
+        async def generate():
+            """ Generate project without arguments. """
+            async with AsyncGenerator(TMPManager(debug=True)) as generator:
+                await generator.generate("cpp", self.directory, force=True)
+
+        with self.assertRaises(TemplateError):
+            self.loop.run_until_complete(generate())
+
+    def test_close_in_thread(self):
+        """ Test if generator is closed without blocking the loop. """
+        threads = []
+
+        async def use_generator():
+            """ Enter and exit generator. """
+            async with AsyncGenerator(TMPManager(debug=True)):
+                pass
+
+        with mock.patch.object(AsyncGenerator, "close",
+                               side_effect=lambda: threads.append(threading.get_ident())):
+            self.loop.run_until_complete(use_generator())
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], threading.get_ident())
+
+
+if __name__ == "__main__":
+    unittest.main()
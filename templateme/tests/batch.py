@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Testing module batch.
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from io import StringIO
+import mock
+import templateme.containers.abstract
+from templateme.batch import read_argument_sets
+from templateme.batch import save_batch
+from templateme.containers.abstract import TemplateError
+from templateme.manager import TMPManager
+from templateme.tests.helpers import make_template
+
+
+# This is tested class. Can have too many method
+class TestBatchModule(unittest.TestCase):  # pylint: disable=R0904
+    """ Module testsCase. """
+
+    def setUp(self):
+        """ Setup temporary directory. """
+        self.directory = tempfile.mkdtemp()
+        self.old_stdout = sys.stdout
+        sys.stdout = StringIO()
+
+    def tearDown(self):
+        """ Remove temporary directory. """
+        sys.stdout = self.old_stdout
+        shutil.rmtree(self.directory)
+
+    def __write(self, name, text):
+        """ Write file in temporary directory. """
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as sets_file:
+            sets_file.write(text)
+        return path
+
+    def test_read_sets(self):
+        """ Test if sets of arguments are read from CSV and JSONL files. """
+        expected = [{'project': "users", 'class': "Users"},
+                    {'project': "orders", 'class': "Orders"}]
+        csv_path = self.__write("sets.csv", "project,class\nusers,Users\norders,Orders\n")
+        self.assertEqual(read_argument_sets(csv_path), expected)
+        jsonl_path = self.__write("sets.jsonl",
+                                  "\n".join(json.dumps(item) for item in expected) + "\n\n")
+        self.assertEqual(read_argument_sets(jsonl_path), expected)
+        with self.assertRaises(TemplateError):
+            read_argument_sets(self.__write("invalid.csv", "class\nUsers\n"))
+        with self.assertRaises(TemplateError):
+            read_argument_sets(self.__write("short.csv", "project,class\nusers\n"))
+        with self.assertRaises(TemplateError):
+            read_argument_sets(self.__write("nested.jsonl", '{"project": "a", "port": [1]}\n'))
+        self.assertEqual(read_argument_sets(self.__write("port.jsonl",
+                                                         '{"project": "a", "port": 8080}\n')),
+                         [{'project': "a", 'port': "8080"}])
+
+    def test_save_batch(self):
+        """ Test if template is compiled once for all projects. """
+        template = TMPManager(debug=True).get_template("cpp")
+        argument_sets = [{'project': "service{}".format(number), 'class': "Class{}".format(number)}
+                         for number in range(6)]
+        compile_text = templateme.containers.abstract.compile_text
+        with mock.patch("templateme.containers.abstract.compile_text",
+                        side_effect=compile_text) as compiled:
+            stats = save_batch(template, argument_sets, path=self.directory, jobs=3)
+        # text and path of every element
+        self.assertEqual(compiled.call_count, 2 * len(template.elements))
+        self.assertEqual(list(stats.values()), [4] * 6)
+        for number in range(6):
+            project = os.path.join(self.directory, "service{}".format(number))
+            with open(os.path.join(project, "lib", "Class{}.h".format(number))) as header:
+                self.assertIn("class Class{}".format(number), header.read())
+        with self.assertRaises(TemplateError):
+            save_batch(template, [{'project': "other"}], path=self.directory)
+        with self.assertRaises(TemplateError):
+            save_batch(template, argument_sets[:1], path=self.directory)
+
+    def test_project_values(self):
+        """ Test if file copied in one project is rendered with values of the next one. """
+        template = make_template(self.directory, "extra",
+                                 {'a.txt': b"extra=%EXTRA%\n", 'b.txt': b"plain\n"})
+        save_batch(template, [{'project': "p1"}, {'project': "p2", 'EXTRA': "yes"}],
+                   path=self.directory)
+        for project, text in (("p1", "extra=%EXTRA%\n"), ("p2", "extra=yes\n")):
+            with open(os.path.join(self.directory, project, "a.txt")) as element_file:
+                self.assertEqual(element_file.read(), text)
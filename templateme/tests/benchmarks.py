@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Testing module benchmarks.
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from io import StringIO
+from templateme.benchmarks import synthesize_tree
+from templateme.benchmarks import tree_manager
+from templateme.benchmarks.__main__ import main as benchmarks_program
+
+
+# This is tested class. Can have too many method
+class TestBenchmarksModule(unittest.TestCase):  # pylint: disable=R0904
+    """ Module testsCase. """
+
+    def setUp(self):
+        """ Setup temporary directory. """
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """ Remove temporary directory. """
+        shutil.rmtree(self.directory)
+
+    def test_synthesize_tree(self):
+        """ Test if synthesized templates have files and includes. """
+        names = synthesize_tree(self.directory, templates=4, files=5, depth=3, include_depth=1)
+        self.assertEqual(names, ["template0", "template1", "template2", "template3"])
+        source = tree_manager(self.directory)[1]
+        self.assertEqual(len(source.get_all_templates()), 4)
+        elements = source.get_template("template1").elements
+        self.assertEqual(len(elements), 10)
+        self.assertEqual(len(elements[0].path.split(os.sep)), 4)
+        self.assertEqual(len(source.get_template("template2").elements), 5)
+
+    def test_json_results(self):
+        """ Test if results of tree benchmark are printed as JSON. """
+        old_stdout = sys.stdout
+        try:
+            sys.stdout = StringIO()
+            benchmarks_program(["--json", "-b", "tree", "--templates", "2", "--files", "3",
+                                "--repeat", "1"])
+            results = json.loads(sys.stdout.getvalue())
+        finally:
+            sys.stdout = old_stdout
+        self.assertEqual([result['name'] for result in results['results']], ["tree"])
+        tree = results['results'][0]
+        self.assertEqual(tree['elements'], 6)
+        for phase in ("get_all_templates", "list_elements", "render_template_txt", "save"):
+            self.assertGreaterEqual(tree[phase], 0)
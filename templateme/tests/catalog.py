@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Testing module catalog.
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+import mock
+from templateme.catalog import Catalog
+from templateme.containers.path import PathSource
+from templateme.manifest import Manifest
+
+
+# This is tested class. Can have too many method
+class TestCatalogModule(unittest.TestCase):  # pylint: disable=R0904
+    """ Module testsCase. """
+
+    def setUp(self):
+        """ Setup directory with templates. """
+        self.directory = tempfile.mkdtemp()
+        self.templates = os.path.join(self.directory, "templates")
+        os.makedirs(os.path.join(self.templates, "first", "src"))
+        with open(os.path.join(self.templates, "first", "manifest.json"), "w") as manifest:
+            json.dump({'description': "first"}, manifest)
+        with open(os.path.join(self.templates, "first", "src", "main.c"), "w") as source:
+            source.write("int main() { return 0; }")
+        self.catalog_path = os.path.join(self.directory, "cache", "catalog.json")
+
+    def tearDown(self):
+        """ Remove directory with templates. """
+        shutil.rmtree(self.directory)
+
+    def __read_source(self):
+        """ Read template from source with catalog and save catalog. """
+        catalog = Catalog(self.catalog_path)
+        source = PathSource(None, self.templates, catalog=catalog)
+        template = source.templates[0]
+        result = (template.description, [elem.path for elem in template.elements])
+        catalog.save()
+        return result
+
+    def __index_files(self):
+        """ Index files of all templates with catalog and return saved catalog. """
+        catalog = Catalog(self.catalog_path)
+        for template in PathSource(None, self.templates, catalog=catalog).templates:
+            for element in template.elements:
+                self.assertFalse(element.info['binary'])
+        catalog.save()
+        with open(self.catalog_path) as catalog_file:
+            return json.load(catalog_file)
+
+    def test_warm_catalog(self):
+        """ Test if saved catalog is used instead of reading templates. """
+        with mock.patch('os.scandir', wraps=os.scandir) as scandir:
+            cold = self.__read_source()
+            self.assertGreater(scandir.call_count, 0)
+        self.assertEqual(cold, ("first", [os.path.join("src", "main.c")]))
+        self.assertTrue(os.path.isfile(self.catalog_path))
+        with mock.patch.object(Manifest, 'create_from_file') as create:
+            with mock.patch('os.scandir', wraps=os.scandir) as scandir:
+                self.assertEqual(self.__read_source(), cold)
+                self.assertEqual(create.call_count, 0)
+                self.assertEqual(scandir.call_count, 0)
+
+    def test_invalid_catalog(self):
+        """ Test if changed templates are read again. """
+        self.__read_source()
+        with open(os.path.join(self.templates, "first", "src", "util.c"), "w") as source:
+            source.write("")
+        with open(os.path.join(self.templates, "first", "manifest.json"), "w") as manifest:
+            json.dump({'description': "changed description"}, manifest)
+        description, elements = self.__read_source()
+        self.assertEqual(description, "changed description")
+        self.assertEqual(sorted(elements), [os.path.join("src", "main.c"),
+                                            os.path.join("src", "util.c")])
+
+    def test_pruned_catalog(self):
+        """ Test if entries of removed templates and files are removed. """
+        os.makedirs(os.path.join(self.templates, "second"))
+        with open(os.path.join(self.templates, "second", "readme.txt"), "w"):
+            pass
+        self.assertEqual(len(self.__index_files()['files']), 2)
+        shutil.rmtree(os.path.join(self.templates, "second"))
+        os.rename(os.path.join(self.templates, "first", "src", "main.c"),
+                  os.path.join(self.templates, "first", "src", "util.c"))
+        data = self.__index_files()
+        self.assertEqual(list(data['templates']), [os.path.join(self.templates, "first")])
+        self.assertEqual(list(data['files']),
+                         [os.path.join(self.templates, "first", "src", "util.c")])
+
+    def test_broken_catalog(self):
+        """ Test if broken catalog file is ignored. """
+        os.makedirs(os.path.dirname(self.catalog_path))
+        with open(self.catalog_path, "w") as catalog_file:
+            catalog_file.write("{ not a json")
+        self.assertEqual(self.__read_source()[0], "first")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,12 +4,50 @@ Testing module console.
 """
 
 from __future__ import unicode_literals
+import os
+import json
+import shutil
+import tempfile
 import unittest
+import subprocess
 import sys
 from io import StringIO
 import mock
 import templateme
 from templateme.console import main as console_program
+from templateme.containers.path import PathSource
+from templateme.manager import TMPManager
+
+
+# Budget of import time in microseconds for cold start of console program.
+STARTUP_BUDGET = {
+    '--version': 50000,
+    '--short-list': 200000
+}
+
+
+def startup_imports(argv):
+    """
+    Run console program with -X importtime.
+
+    Return dictionary with cumulative import time of modules imported
+    by the program (from templateme package on).
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.path.dirname(templateme.__path__[0])
+    process = subprocess.run([sys.executable, "-X", "importtime", "-m", "templateme"] + argv,
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                             env=env, check=True)
+    result = {}
+    for line in process.stderr.decode("utf-8").splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if name.strip() == "templateme" or result:
+            # Nested imports are included in cumulative time of parent
+            if not name[1:].startswith(" "):
+                result[name.strip()] = int(cumulative)
+    return result
 
 
 # This is tested class. Can have too many method
@@ -22,11 +60,13 @@ class TestConsoleModule(unittest.TestCase):  # pylint: disable=R0904
         self.old_stderr = sys.stderr
         sys.stdout = self.tmp_stdout = StringIO()
         sys.stderr = StringIO()
+        self.directory = tempfile.mkdtemp()
 
     def tearDown(self):
         """ Teardown environment. """
         sys.stdout = self.old_stdout
         sys.stderr = self.old_stderr
+        shutil.rmtree(self.directory)
 
     def test_console(self):
         """ Test that console app work ok. """
@@ -62,6 +102,18 @@ class TestConsoleModule(unittest.TestCase):  # pylint: disable=R0904
         self.assertEqual(self.tmp_stdout.getvalue().strip(),
                          "templateme {}".format(templateme.get_version()))
 
+    @unittest.skipIf(sys.version_info < (3, 7), "-X importtime needs python 3.7")
+    def test_startup_time(self):
+        """ Test that console program starts in budget. """
+        for argv, budget in STARTUP_BUDGET.items():
+            imports = startup_imports([argv])
+            self.assertTrue(imports, "No imports found for 'templateme {}'".format(argv))
+            self.assertLess(sum(imports.values()), budget,
+                            "Startup of 'templateme {}' is too slow: {}".format(argv, imports))
+        imports = startup_imports(["--version"])
+        for module in ("templateme.manager", "configparser", "logging"):
+            self.assertNotIn(module, imports)
+
     def test_listing(self):
         """ Testing list of default templates. """
         status = 0
@@ -118,6 +170,35 @@ class TestConsoleModule(unittest.TestCase):  # pylint: disable=R0904
                 status = ex.code  # pylint disable=E0012, R0204
         self.assertEqual(status, 2)
 
+    def test_processes_jobs(self):
+        """ Test if processes save files on every CPU unless jobs are given. """
+        for argv, jobs in ((['--processes'], 7), (['--processes', '-j', '3'], 3)):
+            with mock.patch('templateme.containers.abstract.Template.save') as save, \
+                    mock.patch('os.cpu_count', return_value=7):
+                console_program(['-t', 'cpp', '-q', '-a', 'class=Foo', '-o',
+                                 os.path.join(self.directory, "x")] + argv, debug=True)
+            self.assertEqual(save.call_args[1]['jobs'], jobs)
+            self.assertEqual(save.call_args[1]['backend'], "processes")
+
+    def test_cyclic_include(self):
+        """ Test if cyclic include is reported as error. """
+        for name, include in (("loop1", "loop2"), ("loop2", "loop1")):
+            os.makedirs(os.path.join(self.directory, name))
+            with open(os.path.join(self.directory, name, "manifest.json"), "w") as manifest:
+                json.dump({'include': [include]}, manifest)
+        source = PathSource(TMPManager(debug=True), self.directory)
+        for argv in (['-t', 'loop1', '-o', os.path.join(self.directory, "x"), '-q'],
+                     ['-l', '-t', 'loop1']):
+            status = 0
+            with mock.patch('templateme.manager.TMPManager.get_template',
+                            side_effect=source.get_template):
+                try:
+                    console_program(argv, debug=True)
+                except SystemExit as ex:
+                    status = ex.code
+            self.assertEqual(status, 2)
+            self.assertIn("loop1 -> loop2 -> loop1", self.tmp_stdout.getvalue())
+
 
 if __name__ == "__main__":
     unittest.main()
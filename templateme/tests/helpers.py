@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Helpers of tests.
+"""
+
+import os
+import json
+from templateme.containers.path import PathSource
+from templateme.manager import TMPManager
+
+
+def make_template(directory, name, files, manifest=None, manager=None):
+    """
+    Write template in ``directory`` and find it by manager.
+
+    ``files`` is dictionary with paths and bytes of template's files,
+    ``manifest`` is dictionary saved as manifest.json. Template is written
+    in templates subdirectory, which is added to sources of ``manager``
+    (new manager if it is not given).
+    """
+    templates_path = os.path.join(directory, "templates")
+    template_path = os.path.join(templates_path, name)
+    os.makedirs(template_path)
+    for path, data in files.items():
+        os.makedirs(os.path.dirname(os.path.join(template_path, path)), exist_ok=True)
+        with open(os.path.join(template_path, path), "wb") as data_file:
+            data_file.write(data)
+    if manifest is not None:
+        with open(os.path.join(template_path, "manifest.json"), "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+    manager = TMPManager(debug=True) if manager is None else manager
+    manager.plugins.append(PathSource(manager, templates_path))
+    return manager.get_template(name)
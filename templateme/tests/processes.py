@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Testing module processes.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from io import StringIO
+from contextlib import redirect_stdout
+from templateme.processes import balanced_chunks
+from templateme.tests.helpers import make_template
+
+
+# This is tested class. Can have too many method
+class TestProcessesModule(unittest.TestCase):  # pylint: disable=R0904
+    """ Module testsCase. """
+
+    def setUp(self):
+        """ Setup temporary directory. """
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """ Remove temporary directory. """
+        shutil.rmtree(self.directory)
+
+    def test_balanced_chunks(self):
+        """ Test if chunks have similar total sizes. """
+        sizes = [100, 1, 50, 50, 2, 30, 20, 1]
+        chunks = balanced_chunks(sizes, 3)
+        self.assertEqual(sorted(index for chunk in chunks for index in chunk),
+                         list(range(len(sizes))))
+        self.assertEqual(sorted(sum(sizes[index] for index in chunk) for chunk in chunks),
+                         [74, 80, 100])
+        self.assertEqual(sorted(balanced_chunks([1, 2], 4)), [[0], [1]])
+        self.assertEqual(balanced_chunks([], 4), [])
+
+    def test_process_save(self):
+        """ Test if files saved by processes are the same as saved by threads. """
+        files = {'image.png': b"%CLASS%", 'data.raw': b"%CLASS%\x00", 'plain.txt': b"100% text",
+                 os.path.join("src", "%CLASS%.c"): b"class %CLASS%;\n"}
+        template = make_template(self.directory, "processes", files)
+        template.args.add_values({'class': "Foo"})
+        outputs = {}
+        for backend in ("threads", "processes"):
+            output = os.path.join(self.directory, backend)
+            with redirect_stdout(StringIO()):
+                stats = template.save(output, "project", jobs=2, backend=backend,
+                                      staged=True)
+            self.assertEqual(stats, {'rendered': 1, 'copied': 1, 'binary': 2})
+            outputs[backend] = {}
+            for name in ("image.png", "data.raw", "plain.txt", os.path.join("src", "Foo.c")):
+                with open(os.path.join(output, name), "rb") as data_file:
+                    outputs[backend][name] = data_file.read()
+        self.assertEqual(outputs["processes"], outputs["threads"])
+        self.assertEqual(outputs["processes"][os.path.join("src", "Foo.c")], b"class Foo;\n")
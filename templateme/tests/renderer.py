@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Testing module renderer.
+"""
+
+import unittest
+from io import BytesIO
+from io import StringIO
+from templateme.renderer import compile_text
+from templateme.renderer import render_stream
+from templateme.renderer import index_source
+from templateme.renderer import render_indexed
+from templateme.renderer import SNIFF_SIZE
+from templateme.renderer import RenderSession
+from templateme.renderer import render_text
+
+
+# This is tested class. Can have too many method
+class TestRendererModule(unittest.TestCase):  # pylint: disable=R0904
+    """ Module testsCase. """
+
+    def test_render(self):
+        """ Test if placeholders are replaced by values. """
+        values = {'CLASS': "Foo", 'MODULE': "bar"}
+        self.assertEqual(render_text("class %CLASS% in %MODULE%", values),
+                         "class Foo in bar")
+        self.assertEqual(render_text("%CLASS%%CLASS%", values), "FooFoo")
+        self.assertEqual(render_text("no placeholders", values), "no placeholders")
+        self.assertEqual(render_text("", values), "")
+
+    def test_unknown_placeholders(self):
+        """ Test if unknown placeholders stay in text. """
+        values = {'CLASS': "Foo"}
+        self.assertEqual(render_text("50% of %OTHER%", values), "50% of %OTHER%")
+        self.assertEqual(render_text("%X%CLASS%", values), "%XFoo")
+        self.assertEqual(render_text("%%CLASS%%", values), "%Foo%")
+        self.assertEqual(render_text("%CLASS", values), "%CLASS")
+
+    def test_compiled_text(self):
+        """ Test if compiled text can be rendered many times. """
+        compiled = compile_text("%A% and %B%, not %C%", ["A", "B"])
+        self.assertEqual(compiled.placeholders, frozenset(["A", "B"]))
+        self.assertEqual(compiled.render({'A': "1", 'B': "2"}), "1 and 2, not %C%")
+        self.assertEqual(compiled.render({'A': "3", 'B': "%A%"}), "3 and %A%, not %C%")
+
+    def test_render_session(self):
+        """ Test if session renders text with frozen values. """
+        values = {'CLASS': "Foo"}
+        session = RenderSession(values)
+        values['CLASS'] = "Bar"
+        self.assertEqual(session.render("class %CLASS%"), "class Foo")
+        with self.assertRaises(TypeError):
+            session.values['CLASS'] = "Bar"  # pylint: disable=E1137
+        self.assertTrue(session.indexable)
+        self.assertFalse(RenderSession({'MULTI\nLINE': ""}).indexable)
+
+    def test_index_source(self):
+        """ Test if index finds all possible placeholders. """
+        self.assertEqual(index_source(BytesIO(b"%X%CLASS% 50%")),
+                         {'binary': False, 'placeholders': [" 50", "CLASS", "X"]})
+        self.assertEqual(index_source(BytesIO(b"no placeholders")),
+                         {'binary': False, 'placeholders': []})
+        self.assertTrue(index_source(BytesIO(b"%CLASS%\x00"))['binary'])
+        long_text = b"x" * 100000 + b"%CLASS%" + b"y" * 100000 + b"%AB%"
+        self.assertEqual(index_source(BytesIO(long_text), chunk_size=7)['placeholders'],
+                         ["AB", "CLASS"])
+
+    def test_render_indexed(self):
+        """ Test if file is indexed while it is rendered. """
+        text = b"%X%CLASS% 50%\r\n" * 5000 + "\u017c %AB%".encode("utf-8")
+        source = BytesIO(text)
+        output = StringIO()
+        info = render_indexed(source, source.read(SNIFF_SIZE), output, {'CLASS': "Foo"})
+        self.assertEqual(info, index_source(BytesIO(text)))
+        self.assertEqual(output.getvalue(),
+                         text.decode("utf-8").replace("%CLASS%", "Foo"))
+
+    def test_render_stream(self):
+        """ Test if placeholders split between chunks are rendered. """
+        values = {'CLASS': "Foo", 'AB': "bar"}
+        texts = ["class %CLASS% in %AB%", "%X%CLASS%%AB%%", "50% of %OTHER% %CLASS",
+                 "%" + "long text " * 10 + "%AB%", "%%CLASS%%AB"]
+        for text in texts:
+            for chunk_size in range(1, len(text) + 2):
+                output = StringIO()
+                render_stream(StringIO(text), output, values, chunk_size=chunk_size)
+                self.assertEqual(output.getvalue(), render_text(text, values),
+                                 "Chunk size {} of text [{}]".format(chunk_size, text))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,9 +3,29 @@
 Testing module templates.
 """
 
+import os
+import json
+import shutil
+import tempfile
+import sys
 import unittest
+import tarfile
+import zipfile
+from io import StringIO
+from io import BytesIO
+from contextlib import redirect_stdout
+import mock
+from templateme.archive import ArchiveWriter
 from templateme.containers.abstract import TMPSource
 from templateme.containers.abstract import Template
+from templateme.containers.abstract import TemplateError
+from templateme.containers.path import PathElement
+from templateme.containers.path import PathSource
+from templateme.manager import TMPManager
+from templateme.manifest import Manifest
+from templateme.renderer import compile_text
+from templateme.renderer import RenderSession
+from templateme.tests.helpers import make_template
 
 
 class TemplateTested(Template):
@@ -20,10 +40,30 @@ class TemplateTested(Template):
         return None
 
 
+class IndexedTemplate(Template):
+    """ Template object which counts searching of elements. """
+
+    def __init__(self, name):
+        Template.__init__(self, name, None)
+        self.searched = 0
+
+    def _get_elements(self):
+        self.searched += 1
+        return []
+
+
 # This is tested class. Can have too many method
 class TestTemplatesModule(unittest.TestCase):  # pylint: disable=R0904
     """ Module testsCase. """
 
+    def setUp(self):
+        """ Setup temporary directory. """
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """ Remove temporary directory. """
+        shutil.rmtree(self.directory)
+
     def test_source_template(self):
         """ Test if template source works ok. """
         class SourceTestTemplate(TMPSource):
@@ -40,5 +80,297 @@ class TestTemplatesModule(unittest.TestCase):  # pylint: disable=R0904
         self.assertEqual(source.get_template("tested_temp").test_key, "test")
         self.assertIsNone(source.get_template("not_exist"))
 
+    def test_elements_index(self):
+        """ Test if elements are searched once until invalidate. """
+        template = IndexedTemplate("indexed")
+        self.assertEqual(template.elements, [])
+        self.assertEqual(template.elements, [])
+        self.assertEqual(template.searched, 1)
+        template.invalidate()
+        self.assertEqual(template.elements, [])
+        self.assertEqual(template.searched, 2)
+
+    def test_invalidate_manifest(self):
+        """ Test if changed manifest is loaded again after invalidate. """
+        files = {'main.c': b"main", 'image.dat': b"data", 'run.log': b"log"}
+        template = make_template(self.directory, "changed", files, {'description': "old"})
+        self.assertEqual(template.description, "old")
+        self.assertFalse(template.is_binary_path("image.dat"))
+        self.assertEqual(len(template.elements), 3)
+        manifest_path = os.path.join(self.directory, "templates", "changed", "manifest.json")
+        with open(manifest_path, "w") as manifest:
+            json.dump({'description': "new", 'binary': ["*.dat"], 'ignore': ["*.log"]},
+                      manifest)
+        self.assertEqual(template.description, "old")
+        template.invalidate()
+        self.assertEqual(template.description, "new")
+        self.assertTrue(template.is_binary_path("image.dat"))
+        self.assertEqual(sorted(element.path for element in template.elements),
+                         ["image.dat", "main.c"])
+
+    def test_lazy_manifest(self):
+        """ Test if manifest is read only when template's data is used. """
+        for name in ("first", "second"):
+            os.mkdir(os.path.join(self.directory, name))
+            with open(os.path.join(self.directory, name, "manifest.json"), "w") as manifest:
+                json.dump({'description': name}, manifest)
+        source = PathSource(None, self.directory)
+        with mock.patch.object(Manifest, 'create_from_file',
+                               wraps=Manifest.create_from_file) as create:
+            template = source.get_template("first")
+            self.assertIsNone(source.get_template("not_exist"))
+            self.assertEqual(len(source.templates), 2)
+            self.assertEqual(create.call_count, 0)
+            self.assertEqual(template.description, "first")
+            self.assertEqual(create.call_count, 1)
+            self.assertIs(source.get_template("first"), template)
+
+    def test_parallel_save(self):
+        """ Test if template saved by threads is the same as saved in order. """
+        old_stdout = sys.stdout
+        outputs = []
+        try:
+            for jobs in (1, 4):
+                sys.stdout = StringIO()
+                output = os.path.join(self.directory, str(jobs))
+                template = TMPManager(debug=True).get_template("python3-consoleapp")
+                template.args.add_values({'module': "tested", 'url': "http://localhost"})
+                template.save(output, "project", jobs=jobs)
+                outputs.append(sys.stdout.getvalue().replace(output, "OUTPUT"))
+                files = {}
+                for element in template.elements:
+                    with open(os.path.join(output, element.save_path)) as saved:
+                        files[element.save_path] = saved.read()
+                outputs.append(files)
+        finally:
+            sys.stdout = old_stdout
+        self.assertEqual(outputs[0], outputs[2])
+        self.assertEqual(outputs[1], outputs[3])
+
+    def test_binary_elements(self):
+        """ Test if binary files are copied without rendering. """
+        files = {
+            'image.png': b"%CLASS%\x89PNG",
+            'data.raw': b"%CLASS%\x00\x01",
+            'data.txt': b"%CLASS%",
+            'asset.dat': b"%CLASS%",
+            'plain.txt': b"100% plain text"
+        }
+        template = make_template(self.directory, "binary", files, {'binary': "*.dat"})
+        template.args.add_values({'class': "Foo"})
+        with redirect_stdout(StringIO()):
+            stats = template.save(os.path.join(self.directory, "output"), "project")
+        self.assertEqual(stats, {'rendered': 1, 'copied': 1, 'binary': 3})
+        for name, data in files.items():
+            with open(os.path.join(self.directory, "output", name), "rb") as data_file:
+                expected = b"Foo" if name == "data.txt" else data
+                self.assertEqual(data_file.read(), expected, name)
+
+    def test_single_read(self):
+        """ Test if source of element is read once when it is indexed and saved. """
+        files = {'ph.txt': b"x=%CLASS%\n", 'plain.txt': b"plain\n", 'data.raw': b"%CLASS%\x00"}
+        template = make_template(self.directory, "single", files)
+        template.args.add_values({'class': "Foo"})
+        with mock.patch.object(PathElement, 'open_binary', autospec=True,
+                               side_effect=PathElement.open_binary) as open_binary, \
+                mock.patch.object(PathElement, 'open_source', autospec=True,
+                                  side_effect=PathElement.open_source) as open_source:
+            for _ in range(2):
+                with redirect_stdout(StringIO()):
+                    stats = template.save(os.path.join(self.directory, "output"), "project",
+                                          force=True)
+                self.assertEqual(stats, {'rendered': 1, 'copied': 1, 'binary': 1})
+        self.assertEqual(open_binary.call_count, 3)
+        self.assertEqual(open_source.call_count, 1)
+        with open(os.path.join(self.directory, "output", "ph.txt"), "rb") as data_file:
+            self.assertEqual(data_file.read(), b"x=Foo\n")
+
+    def test_crlf_elements(self):
+        """ Test if copied and rendered files keep new lines of sources. """
+        files = {'plain.txt': b"a\r\nb\r\n", 'ph.txt': b"x=%CLASS%\r\ny\r\n"}
+        expected = {'plain.txt': b"a\r\nb\r\n", 'ph.txt': b"x=Foo\r\ny\r\n"}
+        template = make_template(self.directory, "crlf", files)
+        template.args.add_values({'class': "Foo"})
+        self.assertEqual(template.render(), expected)
+        for backend in ("threads", "processes"):
+            output = os.path.join(self.directory, backend)
+            with redirect_stdout(StringIO()):
+                template.save(output, "project", jobs=2, backend=backend)
+            for name, data in expected.items():
+                with open(os.path.join(output, name), "rb") as data_file:
+                    self.assertEqual(data_file.read(), data, name)
+        with redirect_stdout(StringIO()):
+            stats = template.save(os.path.join(self.directory, "threads"), "project",
+                                  incremental=True)
+        self.assertEqual(stats, {'unchanged': 2})
+
+    def test_incremental_save(self):
+        """ Test if only changed files are written over existing project. """
+        files = {'image.png': b"\x89PNG\x00", 'main.c': b"class %CLASS%;\n",
+                 'plain.txt': b"plain text\n"}
+        template = make_template(self.directory, "update", files)
+        template.args.add_values({'class': "Foo"})
+        output = os.path.join(self.directory, "output")
+        with redirect_stdout(StringIO()) as stdout:
+            stats = template.save(output, "project", incremental=True)
+            self.assertEqual(stats, {'created': 3})
+            stamps = {name: os.stat(os.path.join(output, name)).st_mtime_ns for name in files}
+            stats = template.save(output, "project", incremental=True)
+            self.assertEqual(stats, {'unchanged': 3})
+            self.assertEqual(stamps, {name: os.stat(os.path.join(output, name)).st_mtime_ns
+                                      for name in files})
+            with open(os.path.join(output, "main.c"), "w") as data_file:
+                data_file.write("class Bar;\n")
+            with open(os.path.join(output, "plain.txt"), "w") as data_file:
+                data_file.write("changed")
+            stats = template.save(output, "project", incremental=True)
+            self.assertEqual(stats, {'updated': 2, 'unchanged': 1})
+            with open(os.path.join(output, "main.c"), "rb") as data_file:
+                self.assertEqual(data_file.read(), b"class Foo;\n")
+            self.assertIn("unchanged file: ", stdout.getvalue())
+
+    def test_archive_save(self):
+        """ Test if template is saved in archives without directory tree. """
+        files = {'image.png': b"\x89PNG%CLASS%\x00", 'src/main.c': b"class %CLASS%;\n"}
+        template = make_template(self.directory, "archived", files)
+        template.args.add_values({'class': "Foo"})
+        expected = {'project/image.png': files['image.png'],
+                    'project/src/main.c': b"class Foo;\n"}
+        output = BytesIO()
+        stats = template.save_archive(output, "tar.gz", project_name="project")
+        self.assertEqual(stats, {'rendered': 1, 'binary': 1})
+        with tarfile.open(fileobj=BytesIO(output.getvalue())) as archive:
+            self.assertEqual({name: archive.extractfile(name).read()
+                              for name in archive.getnames()}, expected)
+        archive_path = os.path.join(self.directory, "project.zip")
+        template.save_archive(archive_path, "zip", project_name="project")
+        with zipfile.ZipFile(archive_path) as archive:
+            self.assertEqual({name: archive.read(name) for name in archive.namelist()},
+                             expected)
+        with self.assertRaises(TemplateError):
+            template.save_archive(archive_path, "zip")
+        self.assertEqual(sorted(os.listdir(self.directory)), ["project.zip", "templates"])
+        with mock.patch("tarfile.open", side_effect=tarfile.CompressionError):
+            with self.assertRaises(tarfile.CompressionError):
+                ArchiveWriter(os.path.join(self.directory, "project.tar.xz"), "tar.xz")
+        self.assertEqual(sorted(os.listdir(self.directory)), ["project.zip", "templates"])
+
+    def test_render_memory(self):
+        """ Test if template is rendered in memory like on disk. """
+        files = {'image.png': b"\x89PNG%CLASS%\x00",
+                 os.path.join("%CLASS%", "main.c"): b"class %CLASS%;\n",
+                 'plain.txt': b"plain text\n"}
+        template = make_template(self.directory, "memory", files, {'args': [{'name': "class"}]})
+        with self.assertRaises(TemplateError):
+            template.render()
+        rendered = template.render({'class': "Foo"})
+        self.assertEqual(rendered, {'image.png': files['image.png'],
+                                    os.path.join("Foo", "main.c"): b"class Foo;\n",
+                                    'plain.txt': files['plain.txt']})
+        self.assertEqual(template.render({'class': "Bar"})[os.path.join("Bar", "main.c")],
+                         b"class Bar;\n")
+        template.args.add_values({'class': "Foo"})
+        with redirect_stdout(StringIO()):
+            template.save(os.path.join(self.directory, "output"), "project")
+        for path, content in rendered.items():
+            with open(os.path.join(self.directory, "output", path), "rb") as data_file:
+                self.assertEqual(data_file.read(), content)
+        with mock.patch("templateme.containers.abstract.TMPElement.render_bytes",
+                        return_value=b"") as render_bytes:
+            tree = template.render(lazy=True)
+            self.assertEqual(len(tree), 3)
+            self.assertEqual(render_bytes.call_count, 0)
+            self.assertEqual(tree['plain.txt'], b"")
+            self.assertEqual(tree['plain.txt'], b"")
+            self.assertEqual(render_bytes.call_count, 1)
+
+    def test_render_path(self):
+        """ Test if rendered path of element is remembered for the same values. """
+        template = TMPManager(debug=True).get_template("cpp")
+        element = [elem for elem in template.elements if elem.path.endswith(".h")][0]
+        with mock.patch('templateme.containers.abstract.compile_text',
+                        wraps=compile_text) as compile_mock:
+            self.assertEqual(element.render_path(RenderSession({'CLASS': "Foo", 'NAME': "x"})),
+                             os.path.join("lib", "Foo.h"))
+            self.assertEqual(element.render_path(RenderSession({'CLASS': "Foo", 'NAME': "y"})),
+                             os.path.join("lib", "Foo.h"))
+            self.assertEqual(element.render_path(RenderSession({'CLASS': "Bar", 'NAME': "y"})),
+                             os.path.join("lib", "Bar.h"))
+            self.assertEqual(compile_mock.call_count, 1)
+
+    def test_ignored_elements(self):
+        """ Test if ignored files and directories are not elements. """
+        template_path = os.path.join(self.directory, "ignored")
+        for subdirectory in ("src", ".git", "__pycache__", "build"):
+            os.makedirs(os.path.join(template_path, subdirectory))
+            with open(os.path.join(template_path, subdirectory, "file.c"), "w"):
+                pass
+        with open(os.path.join(template_path, "manifest.json"), "w") as manifest:
+            json.dump({'ignore': ["build", "*.log"]}, manifest)
+        with open(os.path.join(template_path, "run.log"), "w"):
+            pass
+        template = PathSource(None, self.directory).get_template("ignored")
+        self.assertEqual([element.path for element in template.elements],
+                         [os.path.join("src", "file.c")])
+
+    def test_scanned_elements(self):
+        """ Test if elements are generated in order of directories with stats. """
+        template_path = os.path.join(self.directory, "scanned")
+        os.makedirs(os.path.join(template_path, "src", "lib"))
+        for name in ("main.c", os.path.join("src", "a.c"), os.path.join("src", "lib", "b.c")):
+            with open(os.path.join(template_path, name), "w") as element_file:
+                element_file.write("text")
+        os.symlink(os.path.join(template_path, "src"), os.path.join(template_path, "link"))
+        template = PathSource(None, self.directory, record_stats=True).get_template("scanned")
+        elements = template.elements
+        self.assertEqual(sorted(element.path for element in elements),
+                         ["main.c", os.path.join("src", "a.c"),
+                          os.path.join("src", "lib", "b.c")])
+        paths = [element.path for element in elements]
+        self.assertLess(paths.index(os.path.join("src", "a.c")),
+                        paths.index(os.path.join("src", "lib", "b.c")))
+        self.assertEqual([element.size for element in elements], [4, 4, 4])
+        self.assertTrue(all(element.stat is not None for element in elements))
+
+    def test_manager_registry(self):
+        """ Test if manager finds templates by name. """
+        manager = TMPManager(debug=True)
+        template = manager.get_template("cpp")
+        self.assertEqual(template.name, "cpp")
+        self.assertIs(manager.get_template("cpp"), template)
+        self.assertIs(template.include_templates[0], manager.get_template("cpp-class"))
+        self.assertIsNone(manager.get_template("not_exist"))
+        self.assertEqual(len(manager.get_all_templates()), len(manager.registry))
+
+    def test_include_graph(self):
+        """ Test if shared includes are merged once and cyclic includes are errors. """
+        includes = {'top': ["left", "right"], 'left': ["base"], 'right': ["base"], 'base': [],
+                    'loop1': ["loop2"], 'loop2': ["loop1"], 'broken': ["not_exist"]}
+        for name, include in includes.items():
+            os.makedirs(os.path.join(self.directory, name))
+            with open(os.path.join(self.directory, name, name + ".txt"), "w"):
+                pass
+            with open(os.path.join(self.directory, name, "manifest.json"), "w") as manifest:
+                json.dump({'args': [{'name': name}], 'include': include,
+                           'binary': ["*." + name]}, manifest)
+        manager = TMPManager(debug=True)
+        manager.plugins.append(PathSource(manager, self.directory))
+        template = manager.get_template("top")
+        self.assertEqual([str(inc) for inc in template.included], ["left", "right", "base"])
+        self.assertEqual([element.path for element in template.elements],
+                         ["top.txt", "left.txt", "right.txt", "base.txt"])
+        self.assertTrue(all(element.template is template for element in template.elements))
+        self.assertEqual(sorted(template.args.all), ["base", "left", "right", "top"])
+        self.assertEqual(sorted(template.binary_patterns),
+                         ["*.base", "*.left", "*.right", "*.top"])
+        self.assertIs(template.included[2], manager.get_template("base"))
+        template.invalidate()
+        self.assertEqual(len(template.elements), 4)
+        self.assertRaisesRegex(TemplateError, "loop1 -> loop2 -> loop1",
+                               getattr, manager.get_template("loop1"), "elements")
+        manager.get_template("loop2").invalidate()
+        self.assertRaisesRegex(TemplateError, "not_exist",
+                               getattr, manager.get_template("broken"), "args")
+
 if __name__ == "__main__":
     unittest.main()
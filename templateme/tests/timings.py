@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Testing module timings.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from io import StringIO
+from templateme.manager import TMPManager
+from templateme.tests.helpers import make_template
+from templateme.timings import Timer
+from templateme.timings import Timings
+
+
+# This is tested class. Can have too many method
+class TestTimingsModule(unittest.TestCase):  # pylint: disable=R0904
+    """ Module testsCase. """
+
+    def setUp(self):
+        """ Setup temporary directory. """
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """ Remove temporary directory. """
+        shutil.rmtree(self.directory)
+
+    def test_nested_phases(self):
+        """ Test if nested phases are reported with their stacks. """
+        timings = Timings()
+        timer = Timer([timings])
+        with timer.phase("run"):
+            with timer.phase("save"):
+                timer.element("file.txt", 10, 12, 0.5)
+            with timer.phase("save"):
+                pass
+        self.assertEqual(list(timings.phases), [("run", "save"), ("run",)])
+        self.assertEqual(timings.phases[("run", "save")][0], 2)
+        self.assertEqual(timings.elements, [(("run", "save"), "file.txt", 10, 12, 0.5)])
+        self.assertIn("total of 1 elements", timings.report())
+        folded = dict(line.rsplit(" ", 1) for line in timings.folded())
+        self.assertEqual(set(folded), {"run", "run;save", "run;save;file.txt"})
+        self.assertEqual(folded["run;save;file.txt"], "500000")
+        self.assertEqual(folded["run;save"], "0")
+
+    def test_threads(self):
+        """ Test if every thread has its own phases and pool inherits them. """
+        timings = Timings()
+        timer = Timer([timings])
+        started = threading.Barrier(2)
+
+        def run_phase(name):
+            """ Run phase while the other thread runs its phase. """
+            with timer.phase(name):
+                started.wait()
+                timer.element(name + ".txt", 1, 1, 0.0)
+                started.wait()
+
+        threads = [threading.Thread(target=run_phase, args=(name,)) for name in ("a", "b")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(timings.phases), [("a",), ("b",)])
+        self.assertEqual(sorted(element[:2] for element in timings.elements),
+                         [(("a",), "a.txt"), (("b",), "b.txt")])
+        with timer.phase("save"), ThreadPoolExecutor(max_workers=1) as executor:
+            self.assertEqual(executor.submit(timer.inherit(lambda: timer.stack)).result(),
+                             ("save",))
+            self.assertEqual(executor.submit(lambda: timer.stack).result(), ())
+
+    def test_no_hooks(self):
+        """ Test if timer without hooks does not measure anything. """
+        timer = Timer([])
+        with timer.phase("run"):
+            self.assertEqual(timer.stack, ())
+
+    def test_manager_hook(self):
+        """ Test if manager reports phases and elements of saved template. """
+        manager = TMPManager(debug=True)
+        timings = Timings()
+        manager.add_hook(timings)
+        template = make_template(self.directory, "timed", {'%CLASS%.txt': b"name: %CLASS%\n"},
+                                 manager=manager)
+        template.args.add_values({'class': "foo"})
+        with redirect_stdout(StringIO()):
+            template.save(os.path.join(self.directory, "project"), "project")
+        self.assertIn(("discovery",), timings.phases)
+        self.assertIn(("save",), timings.phases)
+        self.assertIn(("save", "elements"), timings.phases)
+        self.assertEqual([element[1:4] for element in timings.elements],
+                         [(os.path.join(self.directory, "project", "foo.txt"), 14, 10)])
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Testing module writer.
+"""
+
+import os
+import stat
+import shutil
+import tempfile
+import unittest
+from io import StringIO
+from contextlib import redirect_stdout
+import mock
+from templateme.tests.helpers import make_template
+from templateme.writer import ProjectWriter
+
+
+# This is tested class. Can have too many method
+class TestWriterModule(unittest.TestCase):  # pylint: disable=R0904
+    """ Module testsCase. """
+
+    def setUp(self):
+        """ Setup temporary directory. """
+        self.directory = tempfile.mkdtemp()
+        self.project = os.path.join(self.directory, "project")
+
+    def tearDown(self):
+        """ Remove temporary directory. """
+        shutil.rmtree(self.directory)
+
+    def __write(self, writer, name, text):
+        """ Write file of project by writer. """
+        with writer.target(os.path.join(self.project, name)) as target_path:
+            with open(target_path, "w") as output:
+                output.write(text)
+
+    def test_directories(self):
+        """ Test if every directory is created once. """
+        output = StringIO()
+        with mock.patch("os.makedirs", wraps=os.makedirs) as makedirs:
+            with ProjectWriter(self.project, output=output) as writer:
+                for name in ("a.c", "b.c", "c.c"):
+                    self.__write(writer, os.path.join("src", name), name)
+                    writer.report(name)
+                self.__write(writer, "main.c", "main")
+                self.assertEqual(output.getvalue(), "")
+        # os.makedirs calls itself for parents, but no directory is created twice
+        created = [call[0][0] for call in makedirs.call_args_list]
+        self.assertEqual(sorted(created), sorted(set(created)))
+        self.assertEqual(output.getvalue(), "a.c\nb.c\nc.c\n")
+        self.assertEqual(sorted(os.listdir(self.project)), ["main.c", "src"])
+        with open(os.path.join(self.project, "src", "b.c")) as source:
+            self.assertEqual(source.read(), "b.c")
+
+    def test_atomic_file(self):
+        """ Test if file is replaced only when it is complete. """
+        os.makedirs(self.project)
+        with open(os.path.join(self.project, "main.c"), "w") as source:
+            source.write("old")
+        writer = ProjectWriter(self.project)
+        with self.assertRaises(ValueError):
+            with writer.target(os.path.join(self.project, "main.c")) as target_path:
+                with open(target_path, "w") as output:
+                    output.write("new")
+                raise ValueError()
+        self.assertEqual(os.listdir(self.project), ["main.c"])
+        with open(os.path.join(self.project, "main.c")) as source:
+            self.assertEqual(source.read(), "old")
+
+    def test_file_mode(self):
+        """ Test if re-rendered executable keeps its mode and links are written through. """
+        template = make_template(self.directory, "script",
+                                 {'run.sh': b"echo %CLASS%\n", 'link.txt': b"%CLASS%\n"})
+        template.args.add_values({'class': "Foo"})
+        with redirect_stdout(StringIO()):
+            template.save(self.project, "project")
+            os.chmod(os.path.join(self.project, "run.sh"), 0o755)
+            os.rename(os.path.join(self.project, "link.txt"),
+                      os.path.join(self.directory, "real.txt"))
+            os.symlink(os.path.join(self.directory, "real.txt"),
+                       os.path.join(self.project, "link.txt"))
+            template.args.add_values({'class': "Bar"})
+            template.save(self.project, "project", force=True)
+        self.assertEqual(stat.S_IMODE(os.stat(os.path.join(self.project, "run.sh")).st_mode),
+                         0o755)
+        self.assertTrue(os.path.islink(os.path.join(self.project, "link.txt")))
+        with open(os.path.join(self.directory, "real.txt")) as real:
+            self.assertEqual(real.read(), "Bar\n")
+
+    def test_staged_project(self):
+        """ Test if staged project is moved to its place at the end. """
+        with ProjectWriter(self.project, staged=True, output=StringIO()) as writer:
+            self.assertTrue(writer.staged)
+            self.__write(writer, os.path.join("src", "main.c"), "main")
+            self.assertFalse(os.path.exists(self.project))
+        with open(os.path.join(self.project, "src", "main.c")) as source:
+            self.assertEqual(source.read(), "main")
+        with self.assertRaises(ValueError):
+            with ProjectWriter(os.path.join(self.directory, "failed"), staged=True) as writer:
+                self.__write(writer, "main.c", "main")
+                raise ValueError()
+        self.assertEqual(sorted(os.listdir(self.directory)), ["project"])
+        self.assertFalse(ProjectWriter(self.project, staged=True).staged)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Module to measure phases of project's generation.
+
+Hooks are added to manager with :meth:`TMPManager.add_hook`. Manager's
+:class:`Timer` tells every hook when a phase of generation ends (e.g.
+searching of templates, reading of manifest, searching of elements,
+saving) and when an element is written. Phases can be nested, so every
+phase is identified by the stack of names of phases it is part of.
+Nothing is measured when manager has no hooks.
+
+:class:`Timings` is a hook which remembers all measurements and prints
+them as a report or as stacks for flame graph tools::
+
+    timings = Timings()
+    manager.add_hook(timings)
+    template.save("project", "project")
+    print(timings.report())
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class Hook:
+    """ Base of hooks, every method does nothing. """
+
+    def phase(self, stack, seconds):
+        """
+        Phase of generation ended.
+
+        ``stack`` is tuple with names of phases, the last one has ended.
+        """
+
+    def element(self, stack, path, bytes_read, bytes_written, seconds):
+        """ Element was written in path during phases from stack. """
+
+
+class Timer:
+    """
+    Measure phases for list of hooks.
+
+    Every thread has its own stack of phases, so phases and elements
+    belong to phases started by the same thread. Functions run by pool
+    of threads are wrapped by :meth:`inherit` to belong to phases of the
+    thread which submits them.
+    """
+
+    def __init__(self, hooks):
+        self.hooks = hooks
+        self.__local = threading.local()
+
+    @property
+    def stack(self):
+        """ Tuple with names of phases running in current thread. """
+        return getattr(self.__local, "stack", ())
+
+    @contextmanager
+    def phase(self, name):
+        """ Measure phase with name. """
+        if not self.hooks:
+            yield
+            return
+        parent = self.stack
+        stack = self.__local.stack = parent + (name,)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.__local.stack = parent
+            for hook in self.hooks:
+                hook.phase(stack, seconds)
+
+    def inherit(self, function):
+        """ Function which runs in phases of current thread from any thread. """
+        stack = self.stack
+
+        def run(*args, **kwargs):
+            """ Call function with stack of phases of submitting thread. """
+            parent = self.stack
+            self.__local.stack = stack
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.__local.stack = parent
+        return run
+
+    def element(self, path, bytes_read, bytes_written, seconds):
+        """ Report written element. """
+        for hook in self.hooks:
+            hook.element(self.stack, path, bytes_read, bytes_written, seconds)
+
+
+# Timer of objects which have not manager.
+NO_TIMER = Timer([])
+
+
+class Timings(Hook):
+    """ Hook which remembers times of phases and elements. """
+
+    def __init__(self):
+        self.phases = OrderedDict()
+        self.elements = []
+
+    def phase(self, stack, seconds):
+        count, total = self.phases.get(stack, (0, 0.0))
+        self.phases[stack] = (count + 1, total + seconds)
+
+    def element(self, stack, path, bytes_read, bytes_written, seconds):
+        self.elements.append((stack, path, bytes_read, bytes_written, seconds))
+
+    def report(self, elements=10):
+        """ Text with times of phases and of the slowest elements. """
+        lines = ["{:<40} {:>6} {:>10}".format("phase", "count", "seconds")]
+        for stack in sorted(self.phases):
+            count, total = self.phases[stack]
+            name = "  " * (len(stack) - 1) + stack[-1]
+            lines.append("{:<40} {:>6} {:>10.4f}".format(name, count, total))
+        if self.elements:
+            lines.append("")
+            lines.append("{:<40} {:>10} {:>10} {:>10}".format("element", "read", "written",
+                                                              "seconds"))
+            slowest = sorted(self.elements, key=lambda element: -element[4])[:elements]
+            for _, path, bytes_read, bytes_written, seconds in slowest:
+                lines.append("{:<40} {:>10} {:>10} {:>10.4f}".format(path, bytes_read,
+                                                                     bytes_written, seconds))
+            lines.append("{:<40} {:>10} {:>10}".format(
+                "total of {} elements".format(len(self.elements)),
+                sum(element[2] for element in self.elements),
+                sum(element[3] for element in self.elements)))
+        return "\n".join(lines)
+
+    def folded(self):
+        """
+        Lines of folded stacks with microseconds, for flame graph tools.
+
+        Time of every phase is reduced by time of its nested phases and
+        elements, so it is not counted twice.
+        """
+        own = OrderedDict((stack, total) for stack, (_, total) in self.phases.items())
+        for stack, path, _, _, seconds in self.elements:
+            own[stack + (path,)] = own.get(stack + (path,), 0.0) + seconds
+        for stack, (_, total) in self.phases.items():
+            if len(stack) > 1 and stack[:-1] in own:
+                own[stack[:-1]] -= total
+        for stack, path, _, _, seconds in self.elements:
+            if stack in own:
+                own[stack] -= seconds
+        return ["{} {}".format(";".join(stack), max(int(seconds * 1000000), 0))
+                for stack, seconds in own.items()]
+
+    def save_folded(self, path):
+        """ Write folded stacks to file. """
+        with open(path, "w") as folded_file:
+            for line in self.folded():
+                folded_file.write(line + "\n")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Module to write files of generated project.
+
+:class:`ProjectWriter` is shared by all elements of one saved template.
+Every directory of project is created only once, every file is written
+to temporary file and renamed to its place when it is complete, so
+other programs never see half written files. Whole project can be also
+staged in temporary directory which is renamed to the project's
+directory at the end. Messages about saved files are buffered and
+printed in blocks.
+"""
+
+import os
+import sys
+import shutil
+import threading
+from contextlib import contextmanager
+
+# Number of buffered messages after which they are printed.
+BUFFER_LINES = 256
+
+
+class ProjectWriter:
+    """
+    Writer of files in project's directory.
+
+    Project is staged only when its directory does not exist yet, files
+    of existing project are replaced one by one.
+    """
+
+    def __init__(self, path, staged=False, output=None):
+        self.path = os.path.abspath(path)
+        self.staged = staged and not os.path.lexists(self.path)
+        self.__output = output
+        self.__directories = set()
+        self.__messages = []
+        self.__root = self.path
+        if self.staged:
+            self.__root = "{}.{}.tmp".format(self.path, os.getpid())
+            os.makedirs(self.__root)
+            self.__directories.add(self.__root)
+
+    @property
+    def root(self):
+        """ Directory where files are written, staging directory of staged project. """
+        return self.__root
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+    def directory(self, directory):
+        """
+        Create directory of project if it was not created before.
+
+        Threads can create the same directory at once, it is not an error.
+        """
+        if directory in self.__directories:
+            return
+        os.makedirs(directory, exist_ok=True)
+        while directory.startswith(self.__root) and directory not in self.__directories:
+            self.__directories.add(directory)
+            directory = os.path.dirname(directory)
+
+    @contextmanager
+    def target(self, save_path):
+        """
+        Path where file of project should be written.
+
+        File written in the path is moved to ``save_path`` when the
+        context ends without error and removed otherwise. Existing file
+        keeps its mode and symbolic link is written through.
+        """
+        save_path = os.path.abspath(save_path)
+        if self.staged:
+            staged_path = os.path.join(self.__root, os.path.relpath(save_path, self.path))
+            self.directory(os.path.dirname(staged_path))
+            yield staged_path
+            return
+        if os.path.islink(save_path):
+            save_path = os.path.realpath(save_path)
+        self.directory(os.path.dirname(save_path))
+        temp_path = "{}.{}.{}.tmp".format(save_path, os.getpid(), threading.get_ident())
+        try:
+            yield temp_path
+            if os.path.exists(save_path):
+                shutil.copymode(save_path, temp_path)
+            os.replace(temp_path, save_path)
+        except BaseException:
+            if os.path.lexists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def report(self, message):
+        """ Add message about saved file. """
+        self.__messages.append(message)
+        if len(self.__messages) >= BUFFER_LINES:
+            self.flush()
+
+    def flush(self):
+        """ Print buffered messages. """
+        if self.__messages:
+            output = self.__output if self.__output is not None else sys.stdout
+            output.write("".join(message + "\n" for message in self.__messages))
+            self.__messages = []
+
+    def commit(self):
+        """ Move staged project to its place and print messages. """
+        if self.staged:
+            os.rename(self.__root, self.path)
+            self.staged = False
+            self.__root = self.path
+        self.flush()
+
+    def abort(self):
+        """ Remove staged project, written files of existing project are kept. """
+        if self.staged:
+            shutil.rmtree(self.__root, ignore_errors=True)
+            self.__messages = []
+        self.flush()